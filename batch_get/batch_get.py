@@ -0,0 +1,89 @@
+import logging
+import json
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sispe_common.db import create_db_engine
+from sispe_common.pagination import is_hex
+from sispe_common.serializer import row_encoder
+from sispe_common.tables import categories, films, users
+
+# Configuración del logger
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Configuración de la base de datos
+db_connection = create_db_engine()
+
+# IDs por solicitud
+MAX_IDS = 500
+
+# Columnas que se regresan por entidad; password nunca sale de la base de datos
+ENTITIES = {
+    'films': list(films.c),
+    'users': [column for column in users.c if column.name != 'password'],
+    'categories': list(categories.c),
+}
+
+# Valida y decodifica los IDs una sola vez; lanza ValueError con la posición del primero inválido
+def parse_ids(data):
+    ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not ids:
+        raise ValueError('ids must be a non-empty list')
+    if len(ids) > MAX_IDS:
+        raise ValueError(f'At most {MAX_IDS} ids per request')
+    for index, value in enumerate(ids):
+        if not isinstance(value, str) or not is_hex(value):
+            raise ValueError(f'Invalid id at position {index}')
+    return [bytes.fromhex(value) for value in ids]
+
+# Resuelve los IDs con un solo WHERE pk IN (...) y arma la respuesta en el orden de la
+# solicitud: {"results": [fila | null, ...], "missing": [id, ...]}
+def fetch_by_ids(conn, columns, ids):
+    primary_key = columns[0]
+    query = select(columns).where(primary_key.in_(set(ids)))
+    encode_row = row_encoder(columns)
+    found = {row[0]: encode_row(row) for row in conn.execute(query)}
+    results = ', '.join(found.get(row_id, 'null') for row_id in ids)
+    missing = list(dict.fromkeys(row_id.hex() for row_id in ids if row_id not in found))
+    return '{"results": [' + results + '], "missing": ' + json.dumps(missing) + '}'
+
+# Función Lambda para obtener en lote películas, usuarios o categorías por ID
+def lambda_handler(event, context):
+    try:
+        entity = (event.get('pathParameters') or {}).get('entity')
+        if entity not in ENTITIES:
+            return {
+                'statusCode': 404,
+                'body': json.dumps(f'Unknown entity, expected one of {", ".join(ENTITIES)}')
+            }
+        ids = parse_ids(json.loads(event.get('body') or '{}'))
+        logger.info(f"Fetching {len(ids)} {entity} by id")
+
+        with db_connection.connect() as conn:
+            body = fetch_by_ids(conn, ENTITIES[entity], ids)
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': body
+        }
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON format: {e}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps('Invalid JSON format')
+        }
+    except ValueError as e:
+        logger.error(f"Invalid ids: {e}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps(str(e))
+        }
+    except SQLAlchemyError as e:
+        logger.error(f"Error fetching {entity}: {e}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps(f'Error fetching {entity}')
+        }
@@ -0,0 +1 @@
+# Código compartido por las funciones Lambda de sispe (se publica como Lambda layer)
@@ -0,0 +1,123 @@
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from sqlalchemy import bindparam, select
+from sispe_common.tables import catalog_versions
+
+logger = logging.getLogger()
+
+FILMS_CATALOG = 'films'
+DEFAULT_CACHE_DIR = '/tmp/sispe_catalog'
+
+
+# Lectura por llave primaria de la versión actual del catálogo; se hace en casi cada invocación,
+# así que la sentencia se arma una sola vez
+SELECT_CATALOG_VERSION = select([catalog_versions.c.version]).where(catalog_versions.c.catalog == bindparam('catalog'))
+
+
+# Versión actual del catálogo (0 si aún no existe)
+def get_catalog_version(conn, catalog=FILMS_CATALOG):
+    row = conn.execute(SELECT_CATALOG_VERSION, {'catalog': catalog}).fetchone()
+    return row[0] if row else 0
+
+
+# Debe llamarse dentro de la transacción que modifica el catálogo
+def bump_catalog_version(conn, catalog=FILMS_CATALOG):
+    result = conn.execute(catalog_versions.update()
+                          .where(catalog_versions.c.catalog == catalog)
+                          .values(version=catalog_versions.c.version + 1))
+    if not result.rowcount:
+        conn.execute(catalog_versions.insert().values(catalog=catalog, version=1))
+
+
+# Snapshot serializado del catálogo que vive mientras el contenedor esté caliente.
+# Las respuestas se guardan por llave junto con la versión del catálogo con la que se
+# generaron: en memoria las más recientes (LRU) y en /tmp todas las de la versión actual.
+# Cuando la versión cambia todo lo anterior se descarta. Con ttl (segundos) una respuesta
+# también se descarta al envejecer, para datos que cambian sin cambiar la versión.
+class CatalogCache:
+
+    def __init__(self, name, max_entries=64, directory=None, ttl=None):
+        self.version = None
+        self.entries = OrderedDict()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = os.path.join(directory or os.environ.get('CATALOG_CACHE_DIR', DEFAULT_CACHE_DIR), name)
+
+    def get(self, version, key):
+        self._check_version(version)
+        entry = self.entries.get(key)
+        if entry is not None:
+            body, stored_at = entry
+            if self._is_fresh(stored_at):
+                self.entries.move_to_end(key)
+                return body
+            # El archivo se escribió junto con la entrada en memoria: también está vencido
+            del self.entries[key]
+            return None
+        body, stored_at = self._read_file(key)
+        if body is None or not self._is_fresh(stored_at):
+            return None
+        self._remember(key, body, stored_at)
+        return body
+
+    def put(self, version, key, body):
+        self._check_version(version)
+        self._remember(key, body, time.time())
+        self._write_file(key, body)
+
+    def _is_fresh(self, stored_at):
+        return self.ttl is None or time.time() - stored_at < self.ttl
+
+    def _check_version(self, version):
+        if version != self.version:
+            self.version = version
+            self.entries.clear()
+            self._clear_stale_files()
+
+    def _remember(self, key, body, stored_at):
+        self.entries[key] = (body, stored_at)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{self.version}-{digest}.json')
+
+    # Regresa el contenido del snapshot y la hora en que se escribió, o (None, None)
+    def _read_file(self, key):
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as snapshot:
+                return snapshot.read(), os.path.getmtime(path)
+        except FileNotFoundError:
+            return None, None
+        except OSError as e:
+            logger.warning(f"Could not read catalog snapshot: {e}")
+            return None, None
+
+    def _write_file(self, key, body):
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + '.tmp', 'w', encoding='utf-8') as snapshot:
+                snapshot.write(body)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            logger.warning(f"Could not write catalog snapshot: {e}")
+
+    def _clear_stale_files(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        prefix = f'{self.version}-'
+        for name in names:
+            if not name.startswith(prefix):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
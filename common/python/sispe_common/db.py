@@ -0,0 +1,69 @@
+import logging
+import os
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool, QueuePool
+
+logger = logging.getLogger()
+
+# pool: una sola conexión por contenedor caliente, revisada con un ping antes de usarse.
+# proxy: sin pool (NullPool); RDS Proxy es quien reutiliza las conexiones a MySQL
+POOL_MODES = ('pool', 'proxy')
+
+# Segundos antes de reabrir la conexión del contenedor; muy por debajo del wait_timeout de
+# MySQL, para no depender de que el ping descubra una conexión que el servidor ya cerró
+DEFAULT_POOL_RECYCLE = 300
+
+# Segundos que se espera la conexión del pool. Cada invocación usa a lo más una, así que
+# esperar significa que alguna no se devolvió; es mejor fallar pronto que agotar el timeout
+DEFAULT_POOL_TIMEOUT = 10
+
+
+def database_url():
+    DB_USER = os.environ.get('DB_USER')
+    DB_PASSWORD = os.environ.get('DB_PASSWORD')
+    DB_NAME = os.environ.get('DB_NAME')
+    DB_HOST = os.environ.get('DB_HOST')
+    return f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
+
+
+# Registra en el log si cada conexión que toma una invocación es nueva (y cuánto tardó en
+# abrirse) o reutilizada del contenedor caliente
+def log_connections(engine):
+    @event.listens_for(engine, 'do_connect')
+    def before_connect(dialect, connection_record, cargs, cparams):
+        connection_record.info['connect_started'] = time.perf_counter()
+
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        started = connection_record.info.pop('connect_started', None)
+        connection_record.info['connect_ms'] = (time.perf_counter() - started) * 1000 if started else 0.0
+
+    @event.listens_for(engine, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        connect_ms = connection_record.info.pop('connect_ms', None)
+        if connect_ms is None:
+            logger.info("DB connection reused")
+        else:
+            logger.info(f"DB connection opened in {connect_ms:.1f} ms")
+
+
+# Engine compartido por los handlers. No se conecta al crearse: la primera conexión se abre
+# en la primera invocación. Lee DB_USER, DB_PASSWORD, DB_NAME y DB_HOST, y DB_POOL_MODE,
+# DB_POOL_RECYCLE y DB_POOL_TIMEOUT para el pool
+def create_db_engine(url=None):
+    mode = os.environ.get('DB_POOL_MODE', 'pool')
+    if mode not in POOL_MODES:
+        raise ValueError(f'DB_POOL_MODE must be one of {", ".join(POOL_MODES)}')
+    if mode == 'proxy':
+        engine = create_engine(url or database_url(), poolclass=NullPool)
+    else:
+        engine = create_engine(url or database_url(),
+                               poolclass=QueuePool,
+                               pool_size=1,
+                               max_overflow=0,
+                               pool_pre_ping=True,
+                               pool_recycle=int(os.environ.get('DB_POOL_RECYCLE', DEFAULT_POOL_RECYCLE)),
+                               pool_timeout=int(os.environ.get('DB_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT)))
+    log_connections(engine)
+    return engine
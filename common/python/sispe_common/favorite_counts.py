@@ -0,0 +1,14 @@
+from sispe_common.tables import films
+
+# Películas por UPDATE; acota el tamaño del IN cuando se borra un usuario con muchos favoritos
+CHUNK_SIZE = 500
+
+
+# Suma delta a films.favorite_count de cada película; se llama en la misma transacción
+# que inserta o borra las filas de favorites correspondientes
+def change_favorite_count(conn, film_ids, delta):
+    film_ids = list(film_ids)
+    for start in range(0, len(film_ids), CHUNK_SIZE):
+        conn.execute(films.update()
+                     .where(films.c.film_id.in_(film_ids[start:start + CHUNK_SIZE]))
+                     .values(favorite_count=films.c.favorite_count + delta))
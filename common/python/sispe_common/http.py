@@ -0,0 +1,32 @@
+import hashlib
+
+
+# ETag fuerte calculado sobre el cuerpo ya serializado
+def etag_for(body):
+    return '"' + hashlib.sha256(body.encode('utf-8')).hexdigest()[:32] + '"'
+
+
+# API Gateway conserva las mayúsculas con las que el cliente envió los headers
+def request_header(event, name):
+    name = name.lower()
+    for key, value in (event.get('headers') or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+# If-None-Match usa comparación débil: W/"x" coincide con "x"
+def etag_matches(event, etag):
+    header = request_header(event, 'If-None-Match')
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or any(tag[2:] == etag if tag.startswith('W/') else tag == etag for tag in tags)
+
+
+def not_modified(etag, headers=None):
+    return {
+        'statusCode': 304,
+        'headers': {**(headers or {}), 'ETag': etag},
+        'body': ''
+    }
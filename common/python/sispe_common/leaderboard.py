@@ -0,0 +1,71 @@
+from sqlalchemy import select, func, literal
+from sispe_common.sql import upsert, upsert_from_select
+from sispe_common.tables import film_leaderboard, film_rating_stats, films, rating_priors
+
+PRIOR_ID = 1
+# Prior mientras el refresco programado no haya calculado el promedio global
+DEFAULT_PRIOR_MEAN = 5.0
+DEFAULT_PRIOR_WEIGHT = 10.0
+
+
+# Promedio amortiguado: cada película parte de prior_weight calificaciones con valor prior_mean,
+# así una película con pocas calificaciones no encabeza el ranking por una sola nota alta
+def bayesian_score(prior_mean, prior_weight, rating_count, grade_sum):
+    return (prior_weight * prior_mean + grade_sum) / (prior_weight + rating_count)
+
+
+# Prior vigente como subconsultas, para leerlo dentro de la misma sentencia que lo usa
+def _current_prior():
+    def read(column, default):
+        return func.coalesce(select([column]).where(rating_priors.c.prior_id == PRIOR_ID).scalar_subquery(),
+                             literal(default))
+    return (read(rating_priors.c.prior_mean, DEFAULT_PRIOR_MEAN),
+            read(rating_priors.c.prior_weight, DEFAULT_PRIOR_WEIGHT))
+
+
+# Filas del ranking calculadas desde film_rating_stats; el costo depende del número de
+# películas, nunca del número de calificaciones
+def _ranked_films(prior_mean, prior_weight):
+    score = bayesian_score(prior_mean, prior_weight, film_rating_stats.c.rating_count, film_rating_stats.c.grade_sum)
+    return (select([film_rating_stats.c.fk_film, films.c.fk_category, film_rating_stats.c.rating_count, score])
+            .select_from(film_rating_stats.join(films, films.c.film_id == film_rating_stats.c.fk_film))
+            .where(film_rating_stats.c.rating_count > 0))
+
+
+RANKED_COLUMNS = ['fk_film', 'fk_category', 'rating_count', 'score']
+
+
+def _insert_ranked(conn, query):
+    conn.execute(film_leaderboard.insert().from_select(RANKED_COLUMNS, query))
+
+
+# Recalcula la posición de una película con el prior vigente; se llama en la misma
+# transacción que actualiza sus agregados en film_rating_stats. Si la película se quedó sin
+# calificaciones sale del ranking
+def refresh_film(conn, fk_film):
+    conn.execute(film_leaderboard.delete().where(film_leaderboard.c.fk_film == fk_film))
+    _insert_ranked(conn, _ranked_films(*_current_prior()).where(film_rating_stats.c.fk_film == fk_film))
+
+
+# Como refresh_film, en una sola sentencia, para cuando la película sigue teniendo al menos
+# una calificación (crear o cambiar una nota)
+def rank_film(conn, fk_film):
+    upsert_from_select(conn, film_leaderboard, RANKED_COLUMNS,
+                       _ranked_films(*_current_prior()).where(film_rating_stats.c.fk_film == fk_film),
+                       ['fk_category', 'rating_count', 'score'], ['fk_film'])
+
+
+# Recalcula el prior con el promedio global y reconstruye el ranking completo.
+# Regresa el prior usado y cuántas películas quedaron en el ranking.
+def refresh_all(conn, prior_weight=DEFAULT_PRIOR_WEIGHT):
+    totals = conn.execute(select([func.sum(film_rating_stats.c.grade_sum),
+                                  func.sum(film_rating_stats.c.rating_count)])).fetchone()
+    grade_sum, rating_count = totals[0], totals[1]
+    prior_mean = float(grade_sum) / rating_count if rating_count else DEFAULT_PRIOR_MEAN
+    prior_weight = float(prior_weight)
+    upsert(conn, rating_priors, {'prior_id': PRIOR_ID, 'prior_mean': prior_mean, 'prior_weight': prior_weight},
+           {'prior_mean': prior_mean, 'prior_weight': prior_weight}, ['prior_id'])
+    conn.execute(film_leaderboard.delete())
+    _insert_ranked(conn, _ranked_films(literal(prior_mean), literal(prior_weight)))
+    ranked = conn.execute(select([func.count()]).select_from(film_leaderboard)).scalar()
+    return prior_mean, prior_weight, ranked
@@ -0,0 +1,85 @@
+import json
+from io import StringIO
+from sispe_common.serializer import write_rows
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def is_hex(s):
+    return isinstance(s, str) and len(s) == 32 and all(c in '0123456789abcdefABCDEF' for c in s)
+
+
+# limit de la query string; lanza ValueError si no es un entero entre 1 y maximum
+def parse_limit(params, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    try:
+        limit = int(params.get('limit', default))
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    if limit < 1 or limit > maximum:
+        raise ValueError(f'limit must be between 1 and {maximum}')
+    return limit
+
+
+# offset de la query string; lanza ValueError si no es un entero entre 0 y maximum
+def parse_offset(params, maximum):
+    try:
+        offset = int(params.get('offset', 0))
+    except (TypeError, ValueError):
+        raise ValueError('offset must be an integer')
+    if offset < 0 or offset > maximum:
+        raise ValueError(f'offset must be between 0 and {maximum}')
+    return offset
+
+
+# Id binario en hexadecimal (cursor o llave foránea); None si el parámetro no viene
+def parse_id(params, name):
+    value = params.get(name)
+    if value is None:
+        return None
+    if not is_hex(value):
+        raise ValueError(f'Invalid {name}')
+    return bytes.fromhex(value)
+
+
+# Columnas pedidas en fields= ("title,status") dentro de la lista permitida allowed, en el
+# orden de allowed. Las columnas de required (la llave del cursor) se incluyen siempre. Sin
+# fields regresa allowed completa; lanza ValueError si se pide una columna fuera de allowed
+def parse_fields(params, allowed, required=()):
+    value = params.get('fields')
+    if value is None:
+        return list(allowed)
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    if not names:
+        raise ValueError('fields must not be empty')
+    unknown = names - {column.name for column in allowed}
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}')
+    return [column for column in allowed if column.name in names or column.name in required]
+
+
+# Cursor compuesto "<contador>.<id hex>" para recorrer un orden descendente por contador
+def parse_count_cursor(params, name='cursor'):
+    value = params.get(name)
+    if value is None:
+        return None
+    count, _, row_id = value.partition('.')
+    if not count.isdigit() or not is_hex(row_id):
+        raise ValueError(f'Invalid {name}')
+    return int(count), bytes.fromhex(row_id)
+
+
+# Serializa una página de keyset a partir de las limit + 1 filas que regresó la consulta:
+# {"<key>": [...], "next_cursor": <cursor|null>}. cursor es el nombre de la columna id, cuyo
+# valor se manda en hexadecimal, o una función que arma el cursor a partir de la última fila.
+# Regresa el cuerpo y el número de filas.
+def dump_page(rows, columns, limit, key, cursor):
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = cursor(last) if callable(cursor) else last[cursor].hex()
+    body = StringIO()
+    body.write('{' + json.dumps(key) + ': ')
+    count = write_rows(body, rows[:limit], columns)
+    body.write(', "next_cursor": ' + json.dumps(next_cursor) + '}')
+    return body.getvalue(), count
@@ -0,0 +1,70 @@
+from decimal import Decimal, InvalidOperation
+from sispe_common.sql import upsert
+from sispe_common.tables import GRADE_BUCKETS, film_rating_stats
+
+MIN_GRADE = Decimal('0.0')
+MAX_GRADE = Decimal('9.9')
+
+
+# Convierte el grade recibido en JSON a Decimal y valida que quepa en DECIMAL(2,1)
+def parse_grade(value):
+    try:
+        grade = Decimal(str(value)).quantize(Decimal('0.1'))
+    except (InvalidOperation, ValueError):
+        raise ValueError('grade must be a number')
+    if not grade.is_finite():
+        raise ValueError('grade must be a number')
+    if grade < MIN_GRADE or grade > MAX_GRADE:
+        raise ValueError(f'grade must be between {MIN_GRADE} and {MAX_GRADE}')
+    return grade
+
+
+def bucket_column(grade):
+    return f'bucket_{min(int(grade), GRADE_BUCKETS - 1)}'
+
+
+# Suma una calificación a los agregados de la película (crea la fila si no existe)
+def add_rating(conn, fk_film, grade):
+    bucket = bucket_column(grade)
+    values = {'fk_film': fk_film, 'rating_count': 1, 'grade_sum': grade}
+    values.update({f'bucket_{n}': 0 for n in range(GRADE_BUCKETS)})
+    values[bucket] = 1
+    upsert(conn, film_rating_stats, values, {
+        'rating_count': film_rating_stats.c.rating_count + 1,
+        'grade_sum': film_rating_stats.c.grade_sum + grade,
+        bucket: film_rating_stats.c[bucket] + 1
+    }, ['fk_film'])
+
+
+# Resta una calificación que ya estaba contada en los agregados de la película
+def remove_rating(conn, fk_film, grade):
+    bucket = bucket_column(grade)
+    conn.execute(film_rating_stats.update()
+                 .where(film_rating_stats.c.fk_film == fk_film)
+                 .values({
+                     'rating_count': film_rating_stats.c.rating_count - 1,
+                     'grade_sum': film_rating_stats.c.grade_sum - grade,
+                     bucket: film_rating_stats.c[bucket] - 1
+                 }))
+
+
+# Cambia una calificación ya contada de old_grade a new_grade con un solo UPDATE; el número
+# de calificaciones no cambia
+def change_rating(conn, fk_film, old_grade, new_grade):
+    old_bucket, new_bucket = bucket_column(old_grade), bucket_column(new_grade)
+    values = {'grade_sum': film_rating_stats.c.grade_sum + (new_grade - old_grade)}
+    if old_bucket != new_bucket:
+        values[old_bucket] = film_rating_stats.c[old_bucket] - 1
+        values[new_bucket] = film_rating_stats.c[new_bucket] + 1
+    conn.execute(film_rating_stats.update().where(film_rating_stats.c.fk_film == fk_film).values(values))
+
+
+# Representación JSON de una fila de film_rating_stats (o de una película sin calificaciones)
+def stats_to_dict(fk_film, row=None):
+    count = row['rating_count'] if row else 0
+    return {
+        'fk_film': fk_film.hex(),
+        'rating_count': count,
+        'average': round(float(row['grade_sum']) / count, 2) if count else None,
+        'histogram': {str(n): row[f'bucket_{n}'] if row else 0 for n in range(GRADE_BUCKETS)}
+    }
@@ -0,0 +1,75 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+from json.encoder import encode_basestring_ascii
+
+
+def _encode_binary(value):
+    return '"' + value.hex() + '"'
+
+
+def _encode_decimal(value):
+    return float.__repr__(float(value))
+
+
+def _encode_integer(value):
+    return int.__repr__(value)
+
+
+def _encode_date(value):
+    return '"' + value.isoformat() + '"'
+
+
+# Conversión por tipo de Python de la columna; lo que no aparece aquí se delega a json.dumps
+_ENCODERS = {
+    bytes: _encode_binary,
+    Decimal: _encode_decimal,
+    float: float.__repr__,
+    int: _encode_integer,
+    str: encode_basestring_ascii,
+    datetime: _encode_date,
+    date: _encode_date,
+}
+
+
+def _encoder_for(column):
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return json.dumps
+    return _ENCODERS.get(python_type, json.dumps)
+
+
+# Regresa una función que convierte una fila en su objeto JSON. La tabla de conversión
+# se calcula una vez por columna, no por valor.
+def row_encoder(columns):
+    fields = [(encode_basestring_ascii(column.name) + ': ', _encoder_for(column)) for column in columns]
+
+    def encode_row(row):
+        return '{' + ', '.join([key + ('null' if value is None else encode(value))
+                                for (key, encode), value in zip(fields, row)]) + '}'
+    return encode_row
+
+
+# Escribe las filas como un arreglo JSON en buffer y regresa cuántas se escribieron.
+# Las filas se consumen una a una, así que el resultado puede venir de un cursor en streaming.
+def write_rows(buffer, rows, columns):
+    encode_row = row_encoder(columns)
+    write = buffer.write
+    count = 0
+    write('[')
+    for row in rows:
+        if count:
+            write(', ')
+        write(encode_row(row))
+        count += 1
+    write(']')
+    return count
+
+
+# Igual que write_rows pero regresa el JSON completo como cadena junto con el número de filas
+def dump_rows(rows, columns):
+    buffer = StringIO()
+    count = write_rows(buffer, rows, columns)
+    return buffer.getvalue(), count
@@ -0,0 +1,30 @@
+from sqlalchemy.dialects import mysql, sqlite
+
+
+# INSERT ... ON DUPLICATE KEY UPDATE en MySQL y su equivalente ON CONFLICT DO UPDATE en SQLite.
+# En update_values las columnas de table se refieren a la fila que ya existía. update_values
+# es un dict, o una lista de pares (columna, valor) cuando el orden importa: MySQL aplica las
+# asignaciones de izquierda a derecha y cada una ve el valor que dejaron las anteriores.
+def upsert(conn, table, values, update_values, conflict_columns):
+    if conn.dialect.name == 'sqlite':
+        statement = sqlite.insert(table).values(**values)
+        statement = statement.on_conflict_do_update(index_elements=conflict_columns, set_=dict(update_values))
+    else:
+        statement = mysql.insert(table).values(**values).on_duplicate_key_update(update_values)
+    return conn.execute(statement)
+
+
+# INSERT ... SELECT que, si la fila ya existe, la reemplaza con los valores de update_columns
+# calculados por el SELECT. En SQLite el SELECT debe tener WHERE para que ON CONFLICT no se
+# confunda con el ON de un JOIN.
+def upsert_from_select(conn, table, columns, query, update_columns, conflict_columns):
+    if conn.dialect.name == 'sqlite':
+        statement = sqlite.insert(table).from_select(columns, query)
+        statement = statement.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={column: statement.excluded[column] for column in update_columns})
+    else:
+        statement = mysql.insert(table).from_select(columns, query)
+        statement = statement.on_duplicate_key_update(
+            **{column: statement.inserted[column] for column in update_columns})
+    return conn.execute(statement)
@@ -0,0 +1,102 @@
+from sqlalchemy import MetaData, Table, Column, String, BigInteger, BINARY, Integer, DECIMAL, DateTime, Enum, Float, \
+    ForeignKey, ForeignKeyConstraint, Index, UniqueConstraint
+
+# Esquema único de la base de datos: todos los handlers importan sus tablas de aquí. Las
+# definiciones son estáticas para que importar un handler no abra conexiones ni consulte el
+# esquema (nada de autoload_with), y declaran los índices que crean las migraciones
+metadata = MetaData()
+
+# Definición de la tabla de categorías
+categories = Table('categories', metadata,
+                   Column('category_id', BINARY(16), primary_key=True),
+                   Column('name', String(45), nullable=False))
+
+# Definición de la tabla de films
+films = Table('films', metadata,
+              Column('film_id', BINARY(16), primary_key=True),
+              Column('title', String(60), nullable=False),
+              Column('description', String(255), nullable=False),
+              Column('length', DECIMAL(4, 2), nullable=False),
+              Column('status', Enum('Activo', 'Inactivo', name='status_enum'), nullable=False),
+              Column('fk_category', BINARY(16), ForeignKey('categories.category_id'), nullable=False),
+              Column('front_page', String(255), nullable=False),
+              Column('file', String(255), nullable=False),
+              # Contador desnormalizado de favoritos; lo mantienen los handlers de favoritos y usuarios
+              Column('favorite_count', Integer, nullable=False, server_default='0'),
+              Index('films_status_category_idx', 'status', 'fk_category'),
+              Index('films_popular_idx', 'favorite_count', 'film_id'),
+              Index('films_title_description_ft', 'title', 'description', mysql_prefix='FULLTEXT'))
+
+# Definición de la tabla de subscripciones
+subscriptions = Table('subscriptions', metadata,
+                      Column('subscription_id', BINARY(16), primary_key=True),
+                      Column('start_date', DateTime, nullable=False),
+                      Column('end_date', DateTime, nullable=False),
+                      Index('subscriptions_end_date_idx', 'end_date'))
+
+# Definición de la tabla de usuarios
+users = Table('users', metadata,
+              Column('user_id', BINARY(16), primary_key=True),
+              Column('name', String(60), nullable=False),
+              Column('lastname', String(60), nullable=False),
+              Column('email', String(100), nullable=False),
+              Column('password', String(255), nullable=False),
+              Column('fk_rol', BINARY(16), nullable=False),
+              Column('fk_subscription', BINARY(16), nullable=False),
+              UniqueConstraint('email', name='unique_email'),
+              ForeignKeyConstraint(['fk_rol'], ['roles.rol_id'], name='fk_rol'),
+              ForeignKeyConstraint(['fk_subscription'], ['subscriptions.subscription_id'], name='fk_subscription'),
+              Index('fk_rol_idx', 'fk_rol'),
+              Index('fk_subscription_idx', 'fk_subscription'))
+
+# Definición de la tabla de favoritos
+favorites = Table('favorites', metadata,
+                  Column('favorite_id', BINARY(16), primary_key=True),
+                  Column('fk_user', BINARY(16), ForeignKey('users.user_id'), nullable=False),
+                  Column('fk_film', BINARY(16), ForeignKey('films.film_id'), nullable=False),
+                  UniqueConstraint('fk_user', 'fk_film', name='favorites_user_film_uq'),
+                  Index('favorites_film_idx', 'fk_film'))
+
+# Definición de la tabla de rateings
+rateings = Table('rateings', metadata,
+                 Column('rateing_id', BINARY(16), primary_key=True),
+                 Column('grade', DECIMAL(2, 1), nullable=False),
+                 Column('comment', String(255), nullable=True),
+                 Column('fk_user', BINARY(16), nullable=False),
+                 Column('fk_film', BINARY(16), nullable=False),
+                 # Nota que tenía la fila antes del último reenvío en create_rateing, que la lee de
+                 # vuelta para ajustar los agregados; no forma parte del rateing que se expone
+                 Column('previous_grade', DECIMAL(2, 1), nullable=True),
+                 UniqueConstraint('fk_user', 'fk_film', name='rateings_user_film_uq'),
+                 Index('rateings_film_idx', 'fk_film', 'rateing_id'),
+                 Index('rateings_user_idx', 'fk_user', 'rateing_id'))
+
+# Versión de cada catálogo; los handlers que lo modifican la incrementan en la misma transacción
+catalog_versions = Table('catalog_versions', metadata,
+                         Column('catalog', String(45), primary_key=True),
+                         Column('version', BigInteger, nullable=False))
+
+# Una cubeta del histograma por cada valor entero de grade (DECIMAL(2,1): 0.0 a 9.9)
+GRADE_BUCKETS = 10
+
+# Agregados de calificaciones por película; se mantienen en la misma transacción que rateings
+film_rating_stats = Table('film_rating_stats', metadata,
+                          Column('fk_film', BINARY(16), primary_key=True),
+                          Column('rating_count', Integer, nullable=False),
+                          Column('grade_sum', DECIMAL(12, 1), nullable=False),
+                          *[Column(f'bucket_{n}', Integer, nullable=False) for n in range(GRADE_BUCKETS)])
+
+# Prior del promedio bayesiano (una sola fila); lo recalcula el refresco programado del ranking
+rating_priors = Table('rating_priors', metadata,
+                      Column('prior_id', Integer, primary_key=True, autoincrement=False),
+                      Column('prior_mean', Float, nullable=False),
+                      Column('prior_weight', Float, nullable=False))
+
+# Ranking precalculado de películas por promedio bayesiano de grade
+film_leaderboard = Table('film_leaderboard', metadata,
+                         Column('fk_film', BINARY(16), primary_key=True),
+                         Column('fk_category', BINARY(16), nullable=False),
+                         Column('rating_count', Integer, nullable=False),
+                         Column('score', Float, nullable=False),
+                         Index('film_leaderboard_score_idx', 'score'),
+                         Index('film_leaderboard_category_score_idx', 'fk_category', 'score'))
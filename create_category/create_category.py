@@ -1,27 +1,16 @@
 import json
 import logging
-import uuid
-from sqlalchemy import create_engine, MetaData, Table, Column, String, BINARY
 from sqlalchemy.exc import SQLAlchemyError
-import os
+from sispe_common.db import create_db_engine
+from sispe_common.ids import new_id
+from sispe_common.tables import categories
 
 # Configuración del logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Configuración de la base de datos
-DB_USER = os.environ.get('DB_USER')
-DB_PASSWORD = os.environ.get('DB_PASSWORD')
-DB_NAME = os.environ.get('DB_NAME')
-DB_HOST = os.environ.get('DB_HOST')
-# Cadena de conexión
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-
-metadata = MetaData()
-categories = Table('categories', metadata,
-                   Column('category_id', BINARY(16), primary_key=True),
-                   Column('name', String(45), nullable=False))
+db_connection = create_db_engine()
 
 def lambda_handler(event, context):
     try:
@@ -31,11 +20,9 @@ def lambda_handler(event, context):
         if 'name' not in data:
             raise ValueError('The name field is required.')
         
-        category_id = uuid.uuid4().bytes
-        conn = db_connection.connect()
-        query = categories.insert().values(category_id=category_id, name=data['name'])
-        conn.execute(query)
-        conn.close()
+        category_id = new_id()
+        with db_connection.connect() as conn:
+            conn.execute(categories.insert(), {'category_id': category_id, 'name': data['name']})
         
         return {
             'statusCode': 201,
@@ -1,51 +1,31 @@
-import os
 import logging
 import json
-import uuid
-from sqlalchemy import create_engine, MetaData, Table, Column, String, BINARY, Integer, Enum, ForeignKey, and_
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import BINARY, and_, bindparam
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.sql import select
+from sispe_common.db import create_db_engine
+from sispe_common.favorite_counts import change_favorite_count
+from sispe_common.ids import new_id
+from sispe_common.pagination import is_hex
+from sispe_common.tables import favorites, films, users
 
 # Configuración del logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Configuración de la base de datos
-DB_USER = os.environ.get("DB_USER")
-DB_PASSWORD = os.environ.get("DB_PASSWORD")
-DB_NAME = os.environ.get("DB_NAME")
-DB_HOST = os.environ.get("DB_HOST")
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-metadata = MetaData()
-
-# Definición de la tabla films
-films = Table('films', metadata,
-              Column('film_id', BINARY(16), primary_key=True),
-              Column('title', String(60), nullable=False),
-              Column('description', String(60), nullable=False),
-              Column('length', Integer, nullable=False),
-              Column('status', Enum('activo', 'inactivo', name='status_enum'), nullable=False),
-              Column('fk_category', BINARY(16), ForeignKey('categories.category_id'), nullable=False))
-
-# Definición de la tabla users
-users = Table('users', metadata,
-              Column('user_id', BINARY(16), primary_key=True),
-              Column('name', String(60), nullable=False),
-              Column('lastname', String(60), nullable=False),
-              Column('email', String(100), nullable=False),
-              Column('password', String(225), nullable=False),
-              Column('fk_rol', BINARY(16), ForeignKey('roles.rol_id'), nullable=False),
-              Column('fk_subscription', BINARY(16), ForeignKey('subscription.subscription_id'), nullable=False))
-
-# Definición de la tabla favorites
-favorites = Table('favorites', metadata,
-                  Column('favorite_id', BINARY(16), primary_key=True),
-                  Column('fk_user', BINARY(16), ForeignKey('users.user_id'), nullable=False),
-                  Column('fk_film', BINARY(16), ForeignKey('films.film_id'), nullable=False))
-
-def is_hex(s):
-    return len(s) == 32 and all(c in '0123456789abcdefABCDEF' for c in s)
+db_connection = create_db_engine()
+
+# Sentencias armadas una sola vez por contenedor; los IDs llegan como parámetros. Los nombres
+# no coinciden con columnas de favorites para que el INSERT no los tome como valores.
+# El SELECT solo regresa una fila si el usuario existe y la película existe y está activa, y
+# la llave única (fk_user, fk_film) rechaza el favorito repetido
+INSERT_FAVORITE = favorites.insert().from_select(
+    ['favorite_id', 'fk_user', 'fk_film'],
+    select([bindparam('new_favorite_id', type_=BINARY(16)), users.c.user_id, films.c.film_id]).select_from(
+        users.join(films, and_(films.c.film_id == bindparam('film_id'), films.c.status == 'Activo'))
+    ).where(users.c.user_id == bindparam('user_id')))
+SELECT_USER_ID = select([users.c.user_id]).where(users.c.user_id == bindparam('user_id'))
 
 def lambda_handler(event, context):
     try:
@@ -75,57 +55,29 @@ def lambda_handler(event, context):
         user_id = bytes.fromhex(fk_user)
         film_id = bytes.fromhex(fk_film)
 
-        conn = db_connection.connect()
-
-        # Verificar si el usuario existe
-        user_query = select([users]).where(users.c.user_id == user_id)
-        user_result = conn.execute(user_query).fetchone()
-        if user_result is None:
-            conn.close()
-            return {
-                'statusCode': 400,
-                'body': json.dumps('Usuario no encontrado')
-            }
-
-        # Verificar si la película existe y está activa
-        film_query = select([films]).where(
-            and_(
-                films.c.film_id == film_id,
-                films.c.status == 'activo'
-            )
-        )
-        film_result = conn.execute(film_query).fetchone()
-        if film_result is None:
-            conn.close()
-            return {
-                'statusCode': 400,
-                'body': json.dumps('Película no encontrada o no está activa')
-            }
-
-        # Verificar si la película ya está en favoritos
-        favorite_query = select([favorites]).where(
-            and_(
-                favorites.c.fk_user == user_id,
-                favorites.c.fk_film == film_id
-            )
-        )
-        existing_favorites = conn.execute(favorite_query).fetchone()
-        if existing_favorites:
-            conn.close()
-            return {
-                'statusCode': 400,
-                'body': json.dumps('Película ya agregada a la lista de favoritos')
-            }
-
-        # Insertar la película a favoritos
-        favorite_id = uuid.uuid4().bytes
-        insert_query = favorites.insert().values(
-            favorite_id=favorite_id,
-            fk_user=user_id,
-            fk_film=film_id
-        )
-        conn.execute(insert_query)
-        conn.close()
+        # Insertar la película a favoritos en una sola sentencia
+        params = {'new_favorite_id': new_id(), 'user_id': user_id, 'film_id': film_id}
+
+        with db_connection.connect() as conn:
+            try:
+                # El contador de favoritos de la película cambia en la misma transacción
+                with conn.begin():
+                    inserted = conn.execute(INSERT_FAVORITE, params).rowcount
+                    if inserted:
+                        change_favorite_count(conn, [film_id], 1)
+            except IntegrityError:
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps('Película ya agregada a la lista de favoritos')
+                }
+
+            if not inserted:
+                # Solo cuando no se insertó nada se consulta cuál de las dos condiciones falló
+                user_exists = conn.execute(SELECT_USER_ID, params).fetchone()
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps('Película no encontrada o no está activa' if user_exists else 'Usuario no encontrado')
+                }
 
         return {
             'statusCode': 200,
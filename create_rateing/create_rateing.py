@@ -1,30 +1,24 @@
 import logging
 import json
-from sqlalchemy import create_engine, MetaData, Table, Column, DECIMAL, String, BINARY
+from sqlalchemy import and_, bindparam, select
 from sqlalchemy.exc import SQLAlchemyError
-import os
-import uuid
+from sispe_common.db import create_db_engine
+from sispe_common.ids import new_id
+from sispe_common.leaderboard import rank_film
+from sispe_common.rating_stats import add_rating, change_rating, parse_grade
+from sispe_common.sql import upsert
+from sispe_common.tables import rateings
 
 # Configuración del logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Configuración de la base de datos
-DB_USER = os.environ.get("DB_USER")
-DB_PASSWORD = os.environ.get("DB_PASSWORD")
-DB_NAME = os.environ.get("DB_NAME")
-DB_HOST = os.environ.get("DB_HOST")
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-metadata = MetaData()
+db_connection = create_db_engine()
 
-# Definición de la tabla de rateings
-rateings = Table('rateings', metadata,
-                 Column('rateing_id', BINARY(16), primary_key=True),
-                 Column('grade', DECIMAL(2,1), nullable=False),
-                 Column('comment', String(255), nullable=True),
-                 Column('fk_user', BINARY(16), nullable=False),
-                 Column('fk_film', BINARY(16), nullable=False))
+# Sentencia armada una sola vez por contenedor
+SELECT_RATEING = select([rateings.c.rateing_id, rateings.c.previous_grade])\
+    .where(and_(rateings.c.fk_user == bindparam('fk_user'), rateings.c.fk_film == bindparam('fk_film')))
 
 # Función Lambda para crear un nuevo rateing
 def lambda_handler(event, context):
@@ -32,20 +26,41 @@ def lambda_handler(event, context):
         logger.info("Creating rateing")
         data = json.loads(event['body'])
 
-        rateing_id = uuid.uuid4().bytes
-        conn = db_connection.connect()
-        query = rateings.insert().values(
-            rateing_id=rateing_id,
-            grade=data['grade'],
-            comment=data.get('comment'),
-            fk_user=bytes.fromhex(data['fk_user']),
-            fk_film=bytes.fromhex(data['fk_film'])
-        )
-        conn.execute(query)
-        conn.close()
+        grade = parse_grade(data['grade'])
+        comment = data.get('comment')
+        fk_user = bytes.fromhex(data['fk_user'])
+        fk_film = bytes.fromhex(data['fk_film'])
+        values = {
+            'rateing_id': new_id(),
+            'grade': grade,
+            'comment': comment,
+            'fk_user': fk_user,
+            'fk_film': fk_film
+        }
+
+        with db_connection.connect() as conn:
+            # Un usuario tiene un solo rateing por película (rateings_user_film_uq). El INSERT ... ON
+            # DUPLICATE KEY UPDATE crea la fila o le escribe la nueva nota, y antes guarda la anterior
+            # en previous_grade; el orden de las asignaciones importa en MySQL. No se lee antes con
+            # FOR UPDATE: en una fila que aún no existe eso bloquea el hueco del índice, y dos primeros
+            # envíos simultáneos se bloquean entre sí al insertar (deadlock 1213). Con la fila ya
+            # bloqueada se lee de vuelta; si el rateing_id es el nuevo, la fila se acaba de crear
+            with conn.begin():
+                upsert(conn, rateings, values, [
+                    ('previous_grade', rateings.c.grade),
+                    ('grade', grade),
+                    ('comment', comment)
+                ], ['fk_user', 'fk_film'])
+                current = conn.execute(SELECT_RATEING, {'fk_user': fk_user, 'fk_film': fk_film}).fetchone()
+                created = current['rateing_id'] == values['rateing_id']
+                if created:
+                    add_rating(conn, fk_film, grade)
+                else:
+                    change_rating(conn, fk_film, current['previous_grade'], grade)
+                rank_film(conn, fk_film)
         return {
             'statusCode': 200,
-            'body': json.dumps('Rateing creado')
+            'body': json.dumps('Rateing creado' if created else 'Rateing actualizado')
         }
     except SQLAlchemyError as e:
         logger.error(f"Error creating rateing: {e}")
@@ -59,6 +74,12 @@ def lambda_handler(event, context):
             'statusCode': 400,
             'body': json.dumps('Invalid JSON format')
         }
+    except ValueError as e:
+        logger.error(f"Invalid rateing data: {e}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps(f'Invalid rateing data: {e}')
+        }
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         return {
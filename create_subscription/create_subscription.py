@@ -1,27 +1,17 @@
 import json
 import logging
-import uuid
-from sqlalchemy import create_engine, MetaData, Table, Column, String, BINARY, DateTime
 from sqlalchemy.exc import SQLAlchemyError
-import os
+from sispe_common.db import create_db_engine
+from sispe_common.ids import new_id
+from sispe_common.tables import subscriptions
 from datetime import datetime
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-DB_USER = os.environ.get('DB_USER')
-DB_PASSWORD = os.environ.get('DB_PASSWORD')
-DB_NAME = os.environ.get('DB_NAME')
-DB_HOST = os.environ.get('DB_HOST')
+# Configuración de la base de datos
+db_connection = create_db_engine()
 
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-
-metadata = MetaData()
-subscriptions = Table('subscriptions', metadata,
-                        Column('subscription_id', BINARY(16), primary_key=True),
-                        Column('start_date', DateTime, nullable=False),
-                        Column('end_date', DateTime, nullable=False))
 
 def lambda_handler(event, context):
     try:
@@ -42,11 +32,10 @@ def lambda_handler(event, context):
         if start_date >= end_date:
             raise ValueError('The start date must be before the end date')
 
-        subscription_id = uuid.uuid4().bytes
-        conn = db_connection.connect()
-        query = subscriptions.insert().values(subscription_id=subscription_id, start_date=start_date, end_date=end_date)
-        conn.execute(query)
-        conn.close()
+        subscription_id = new_id()
+        with db_connection.connect() as conn:
+            conn.execute(subscriptions.insert(),
+                         {'subscription_id': subscription_id, 'start_date': start_date, 'end_date': end_date})
 
         response = {
             'subscription_id' : subscription_id.hex(),
@@ -1,27 +1,19 @@
 import json
 import logging
-from sqlalchemy import create_engine, MetaData, Table, Column, String, BINARY
+from sqlalchemy import bindparam
 from sqlalchemy.exc import SQLAlchemyError
-import os
+from sispe_common.db import create_db_engine
+from sispe_common.tables import categories
 
 # Configuración del logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Configuración de la base de datos
-DB_USER = os.environ.get('DB_USER')
-DB_PASSWORD = os.environ.get('DB_PASSWORD')
-DB_NAME = os.environ.get('DB_NAME')
-DB_HOST = os.environ.get('DB_HOST')
+db_connection = create_db_engine()
 
-# Cadena de conexión
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-
-metadata = MetaData()
-categories = Table('categories', metadata,
-                   Column('category_id', BINARY(16), primary_key=True),
-                   Column('name', String(45), nullable=False))
+# Sentencia armada una sola vez por contenedor; category_id llega como parámetro
+DELETE_CATEGORY = categories.delete().where(categories.c.category_id == bindparam('category_id'))
 
 def lambda_handler(event, context):
     try:
@@ -30,10 +22,8 @@ def lambda_handler(event, context):
         # Extraer category_id de los parámetros de la ruta
         category_id = event['pathParameters']['category_id']
         
-        conn = db_connection.connect()
-        query = categories.delete().where(categories.c.category_id == bytes.fromhex(category_id))
-        result = conn.execute(query)
-        conn.close()
+        with db_connection.connect() as conn:
+            result = conn.execute(DELETE_CATEGORY, {'category_id': bytes.fromhex(category_id)})
         
         if result.rowcount == 0:
             return {
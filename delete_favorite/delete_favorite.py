@@ -1,52 +1,28 @@
-import os
 import logging
 import json
-from sqlalchemy import create_engine, MetaData, Table, Column, String, BINARY, Integer, Enum, ForeignKey, DATETIME, and_
-
+from sqlalchemy import and_, bindparam
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql import select
+from sispe_common.db import create_db_engine
+from sispe_common.favorite_counts import change_favorite_count
+from sispe_common.pagination import is_hex
+from sispe_common.tables import favorites, users
 
 #Configuracion del logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 #Configuracion de la base de datos
-DB_USER = os.environ.get("DB_USER")
-DB_PASSWORD = os.environ.get("DB_PASSWORD")
-DB_NAME = os.environ.get("DB_NAME")
-DB_HOST = os.environ.get("DB_HOST")
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-metadata = MetaData()
-
-#Definicion de la tabla films para agregar atributos foraneos a la tabla favorites
-films = Table('film', metadata,
-                   Column('film_id', BINARY(16), primary_key=True),
-                   Column('title', String(60), nullable=False),
-                   Column('description', String(60), nullable=False),
-                   Column('length', Integer, nullable=False),
-                   Column('status', Enum('Activo', 'Inactivo', name='status_enum'), nullable=False),
-                   Column('fk_category', BINARY(16), ForeignKey('categories.category_id'), nullable=False)
-              )
-
-#Definicion de la tabla users para agregar los atributos foraneos a la tabla favorites
-users = Table('users',metadata,
-              Column('user_id', BINARY(16), primary_key=True),
-              Column('name', String(60), nullable=False),
-              Column('lastname', String(60), nullable=False),
-              Column('email', String(100), nullable=False),
-              Column('password', String(225), nullable=False),
-              Column('fk_rol', BINARY(16), ForeignKey('roles.rol_id'), nullable=False),
-              Column('fk_subscription', BINARY(16), ForeignKey('subscription.subscription_id'), nullable=False),)
-
-#Definicion de la tabla favorites
-favorites = Table('favorites',metadata,
-                  Column('favorite_id',BINARY(16), primary_key=True),
-                  Column('fk_user',BINARY(16), ForeignKey('users.user_id'), nullable=False),
-                  Column('fk_film',BINARY(16), ForeignKey('films.film_id'), nullable=False),)
+db_connection = create_db_engine()
 
-def is_hex(s):
-    return len(s) == 32 and all(c in '0123456789abcdefABCDEF' for c in s)
+#Sentencias armadas una sola vez por contenedor; los IDs llegan como parametros
+DELETE_FAVORITE = favorites.delete().where(
+    and_(
+        favorites.c.fk_user == bindparam('user_id'),
+        favorites.c.fk_film == bindparam('film_id'),
+    )
+)
+SELECT_USER_ID = select([users.c.user_id]).where(users.c.user_id == bindparam('user_id'))
 
 #Funcion Lambda para quitar una pelicula de la lista de favoritos
 def lambda_handler(event, context):
@@ -63,7 +39,7 @@ def lambda_handler(event, context):
         fk_user = data.get('fk_user')
         fk_film = data.get('fk_film')
 
-        if not fk_user and not fk_film:
+        if not fk_user or not fk_film:
             return {
                 'statusCode': 400,
                 'body': json.dumps('usuario y pelicula necesario')
@@ -77,45 +53,23 @@ def lambda_handler(event, context):
 
         user_id = bytes.fromhex(fk_user)
         film_id = bytes.fromhex(fk_film)
-        conn = db_connection.connect()
-
-        #Verificar si el usuario existe
-        user_query = select([users]).where(users.c.user_id == user_id)
-        user_result = conn.execute(user_query).fetchone()
-
-        if user_result is None:
-            conn.close()
-            return {
-                'statusCode': 400,
-                'body': json.dumps('Usuario no encontrado')
-            }
-
-        #Verificar si la pelicula ya esta en favoritos
-        query = select([favorites]).where(
-            and_(
-                favorites.c.fk_user == user_id,
-                favorites.c.fk_film == film_id
-            )
-        )
-        result = conn.execute(query)
-        existing_favorites = result.fetchone()
-
-        if not existing_favorites:
-            conn.close()
-            return{
-                'statusCode':400,
-                'body':json.dumps('Pelicula no esta en la lista de favoritos')
-            }
-
-        #Eliminar pelicula de la lista de favoritos
-        query = favorites.delete().where(
-            and_(
-                favorites.c.fk_user == user_id,
-                favorites.c.fk_film == film_id,
-            )
-        )
-        conn.execute(query)
-        conn.close()
+        with db_connection.connect() as conn:
+
+            #Eliminar pelicula de la lista de favoritos en una sola sentencia, junto con el
+            #contador de favoritos de la pelicula en la misma transaccion
+            params = {'user_id': user_id, 'film_id': film_id}
+            with conn.begin():
+                deleted = conn.execute(DELETE_FAVORITE, params).rowcount
+                if deleted:
+                    change_favorite_count(conn, [film_id], -1)
+
+            if not deleted:
+                #Solo si no se elimino nada se consulta si el usuario existe para dar el mensaje correcto
+                user_result = conn.execute(SELECT_USER_ID, params).fetchone()
+                return{
+                    'statusCode':400,
+                    'body':json.dumps('Pelicula no esta en la lista de favoritos' if user_result else 'Usuario no encontrado')
+                }
 
         return{
             'statusCode':200,
@@ -1,37 +1,38 @@
 import logging
 import json
-from sqlalchemy import create_engine, MetaData, Table
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
-import os
+from sispe_common.db import create_db_engine
+from sispe_common.leaderboard import refresh_film
+from sispe_common.rating_stats import remove_rating
+from sispe_common.tables import rateings
 
 # Configuración del logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Configuración de la base de datos
-DB_USER = os.environ.get("DB_USER")
-DB_PASSWORD = os.environ.get("DB_PASSWORD")
-DB_NAME = os.environ.get("DB_NAME")
-DB_HOST = os.environ.get("DB_HOST")
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-metadata = MetaData()
-
-# Definición de la tabla de rateings
-rateings = Table('rateings', metadata, autoload_with=db_connection)
+db_connection = create_db_engine()
 
 # Función Lambda para eliminar un rateing
 def lambda_handler(event, context):
     try:
         logger.info("Deleting rateing")
-        rateing_id = event['pathParameters']['id']
+        rateing_id = bytes.fromhex(event['pathParameters']['id'])
 
-        conn = db_connection.connect()
-        query = rateings.delete().where(rateings.c.rateing_id == bytes.fromhex(rateing_id))
-        result = conn.execute(query)
-        conn.close()
+        with db_connection.connect() as conn:
+            query = rateings.delete().where(rateings.c.rateing_id == rateing_id)
+            # La calificación se descuenta de los agregados y del ranking de la película en la misma transacción
+            with conn.begin():
+                previous = conn.execute(select([rateings.c.grade, rateings.c.fk_film])
+                                        .where(rateings.c.rateing_id == rateing_id)
+                                        .with_for_update()).fetchone()
+                if previous:
+                    conn.execute(query)
+                    remove_rating(conn, previous['fk_film'], previous['grade'])
+                    refresh_film(conn, previous['fk_film'])
 
-        if result.rowcount:
+        if previous:
             return {
                 'statusCode': 200,
                 'body': json.dumps('Rateing deleted')
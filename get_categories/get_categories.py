@@ -1,36 +1,26 @@
 import json
 import logging
-from sqlalchemy import create_engine, MetaData, Table, Column, String, BINARY
 from sqlalchemy.exc import SQLAlchemyError
-import os
+from sispe_common.db import create_db_engine
+from sispe_common.http import etag_for, etag_matches, not_modified
+from sispe_common.tables import categories
 
 # Configuración del logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Configuración de la base de datos
-DB_USER = os.environ.get('DB_USER')
-DB_PASSWORD = os.environ.get('DB_PASSWORD')
-DB_NAME = os.environ.get('DB_NAME')
-DB_HOST = os.environ.get('DB_HOST')
+db_connection = create_db_engine()
 
-# Cadena de conexión
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-
-metadata = MetaData()
-categories = Table('categories', metadata,
-                   Column('category_id', BINARY(16), primary_key=True),
-                   Column('name', String(45), nullable=False))
+# Sentencia armada una sola vez por contenedor
+SELECT_CATEGORIES = categories.select()
 
 def lambda_handler(event, context):
     try:
         logger.info("Fetching all categories")
-        conn = db_connection.connect()
-        query = categories.select()
-        result = conn.execute(query)
-        category_list = [{column: value.hex() if isinstance(value, bytes) else value for column, value in row.items()} for row in result]
-        conn.close()
+        with db_connection.connect() as conn:
+            result = conn.execute(SELECT_CATEGORIES)
+            category_list = [{column: value.hex() if isinstance(value, bytes) else value for column, value in row.items()} for row in result]
         
         if not category_list:
             return {
@@ -38,9 +28,17 @@ def lambda_handler(event, context):
                 'body': json.dumps('No categories found')
             }
         
+        body = json.dumps(category_list)
+        etag = etag_for(body)
+        if etag_matches(event, etag):
+            return not_modified(etag)
+
         return {
             'statusCode': 200,
-            'body': json.dumps(category_list)
+            'headers': {
+                'ETag': etag
+            },
+            'body': body
         }
         
     except SQLAlchemyError as e:
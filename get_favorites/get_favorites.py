@@ -1,65 +1,28 @@
-import os
 import logging
 import json
-from sqlalchemy import create_engine, MetaData, Table, Column, String, BINARY, Integer, ForeignKey, select
+from sqlalchemy import and_, select
 from sqlalchemy.exc import SQLAlchemyError
-from decimal import Decimal
+from sispe_common.db import create_db_engine
+from sispe_common.http import etag_for, etag_matches, not_modified
+from sispe_common.pagination import dump_page, is_hex, parse_fields, parse_id, parse_limit
+from sispe_common.tables import categories, favorites, films, users
 
 # Configuración del logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Configuración de la base de datos
-DB_USER = os.environ.get('DB_USER')
-DB_PASSWORD = os.environ.get('DB_PASSWORD')
-DB_NAME = os.environ.get('DB_NAME')
-DB_HOST = os.environ.get('DB_HOST')
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-metadata = MetaData()
+db_connection = create_db_engine()
 
-# Definicion de la tabla category
-category = Table('categories', metadata,
-                 Column('category_id', BINARY(16), primary_key=True),
-                 Column('name', String(60), nullable=False))
-
-# Definición de la tabla users
-users = Table('users', metadata,
-              Column('user_id', BINARY(16), primary_key=True),
-              Column('name', String(60), nullable=False),
-              Column('lastname', String(60), nullable=False),
-              Column('email', String(100), nullable=False),
-              Column('password', String(225), nullable=False))
-
-# Definición de la tabla films
-films = Table('films', metadata,
-              Column('film_id', BINARY(16), primary_key=True),
-              Column('title', String(60), nullable=False),
-              Column('description', String(255), nullable=False),
-              Column('length', Integer, nullable=False),
-              Column('status', String(50), nullable=False),
-              Column('fk_category', BINARY(16), nullable=False),)
-
-# Definición de la tabla favorites
-favorites = Table('favorites', metadata,
-                  Column('favorite_id', BINARY(16), primary_key=True),
-                  Column('fk_user', BINARY(16), ForeignKey('users.user_id'), nullable=False),
-                  Column('fk_film', BINARY(16), ForeignKey('films.film_id'), nullable=False))
-
-def is_hex(s):
-    return len(s) == 32 and all(c in '0123456789abcdefABCDEF' for c in s)
-
-def custom_converter(obj):
-    if isinstance(obj, Decimal):
-        return float(obj)
-    if isinstance(obj, bytes):
-        return obj.hex()
-    raise TypeError(f'Object of type {obj.__class__.__name__} is not JSON serializable')
+# Columnas de cada favorito que se pueden pedir con fields=
+FAVORITE_FIELDS = [favorites.c.fk_film, films.c.title, films.c.description, films.c.length,
+                   categories.c.name.label('category_name')]
 
+# Función Lambda para obtener los favoritos de un usuario, paginados por fk_film
 def lambda_handler(event, context):
     try:
         # Obtener el pathParameters del evento
-        path_params = event.get('pathParameters', {})
+        path_params = event.get('pathParameters') or {}
         fk_user = path_params.get('fk_user')
 
         if not fk_user:
@@ -75,43 +38,64 @@ def lambda_handler(event, context):
             }
 
         user_id = bytes.fromhex(fk_user)
+        params = event.get('queryStringParameters') or {}
+        limit = parse_limit(params)
+        cursor = parse_id(params, 'cursor')
+        # fk_film es la llave del cursor, así que se incluye aunque no se pida
+        columns = parse_fields(params, FAVORITE_FIELDS, required=('fk_film',))
+
+        # Una sola consulta: el usuario con sus favoritos en LEFT JOIN. Si no regresa filas el
+        # usuario no existe; una fila con fk_film nulo es un usuario sin favoritos. La página se
+        # recorre sobre la llave única (fk_user, fk_film), así que su costo no depende de cuántos
+        # favoritos tenga el usuario. Los JOIN van encadenados y no anidados: un
+        # users LEFT JOIN (favorites JOIN films ...) se puede materializar completo antes de
+        # filtrar por usuario; las llaves foráneas de favorites y films garantizan que cada
+        # favorito tiene su película y su categoría
+        join_condition = favorites.c.fk_user == users.c.user_id
+        if cursor is not None:
+            join_condition = and_(join_condition, favorites.c.fk_film > cursor)
+        favorite_films = users.outerjoin(favorites, join_condition)\
+            .outerjoin(films, favorites.c.fk_film == films.c.film_id)\
+            .outerjoin(categories, films.c.fk_category == categories.c.category_id)
+        # user_id va al final: solo sirve para saber si el usuario existe y no se serializa
+        query = select(columns + [users.c.user_id])\
+            .select_from(favorite_films)\
+            .where(users.c.user_id == user_id)\
+            .order_by(favorites.c.fk_film)\
+            .limit(limit + 1)
+
+        with db_connection.connect() as conn:
+            rows = conn.execute(query).fetchall()
 
-        conn = db_connection.connect()
-
-        # Verificar si el usuario existe
-        user_query = select([users]).where(users.c.user_id == user_id)
-        user_result = conn.execute(user_query).fetchone()
-        if user_result is None:
-            conn.close()
+        if not rows:
             return {
                 'statusCode': 400,
                 'body': json.dumps('Usuario no encontrado')
             }
 
-        # Obtener los favoritos del usuario
-        query = select([favorites.c.fk_film, films.c.title, films.c.description, films.c.length, category.c.name.label('category_name')])\
-                .select_from(favorites.join(films, favorites.c.fk_film == films.c.film_id).join(category,films.c.fk_category == category.c.category_id))\
-                .where(favorites.c.fk_user == user_id)
-        result = conn.execute(query)
-        rows = result.fetchall()
-        conn.close()
-
-        if not rows:
+        if rows[0]['fk_film'] is None:
             return {
                 'statusCode': 200,
                 'body': json.dumps('Favoritos no encontrados')
             }
 
-        # Convertir filas a diccionarios y convertir tipos no serializables
-        favorites_list = []
-        for row in rows:
-            row_dict = dict(row)
-            row_dict['fk_film'] = row_dict['fk_film'].hex()  # Convertir binario a hexadecimal
-            favorites_list.append(row_dict)
+        body, _ = dump_page(rows, list(query.selected_columns)[:-1], limit, 'favorites', 'fk_film')
+        etag = etag_for(body)
+        if etag_matches(event, etag):
+            return not_modified(etag)
 
         return {
             'statusCode': 200,
-            'body': json.dumps(favorites_list, default=custom_converter)
+            'headers': {
+                'ETag': etag
+            },
+            'body': body
+        }
+    except ValueError as e:
+        logger.error(f'Parámetros de consulta inválidos: {e}')
+        return {
+            'statusCode': 400,
+            'body': json.dumps(f'Parámetros de consulta inválidos: {e}')
         }
     except SQLAlchemyError as e:
         logger.error(f'Error fetching favorites: {e}')
@@ -0,0 +1,97 @@
+import logging
+import json
+import os
+from sqlalchemy import bindparam, select
+from sqlalchemy.exc import SQLAlchemyError
+from sispe_common.catalog import CatalogCache, get_catalog_version
+from sispe_common.db import create_db_engine
+from sispe_common.http import etag_for, etag_matches, not_modified
+from sispe_common.pagination import is_hex
+from sispe_common.rating_stats import stats_to_dict
+from sispe_common.tables import categories, film_rating_stats, films
+
+# Configuración del logger
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Configuración de la base de datos
+db_connection = create_db_engine()
+
+# Segundos que una ficha puede servirse desde la caché; update_film y delete_film la invalidan
+# de inmediato al cambiar la versión del catálogo, pero los contadores de favoritos y
+# calificaciones cambian sin cambiarla y se aceptan con este retraso
+DETAIL_TTL = int(os.environ.get('FILM_DETAIL_TTL_SECONDS', '30'))
+
+# Fichas serializadas por película
+film_cache = CatalogCache('film_detail', max_entries=256, ttl=DETAIL_TTL)
+
+# Ficha de una película con su categoría, contador de favoritos y agregados de calificaciones,
+# todo en una sola consulta por llave primaria. Se arma una sola vez por contenedor
+SELECT_FILM = select([films, categories.c.name.label('category_name'), film_rating_stats])\
+    .select_from(films
+                 .join(categories, films.c.fk_category == categories.c.category_id)
+                 .outerjoin(film_rating_stats, film_rating_stats.c.fk_film == films.c.film_id))\
+    .where(films.c.film_id == bindparam('film_id'))
+
+# Regresa el JSON de la ficha o None si no existe
+def fetch_film(conn, film_id):
+    row = conn.execute(SELECT_FILM, {'film_id': film_id}).fetchone()
+    if row is None:
+        return None
+    return json.dumps({
+        'film_id': row['film_id'].hex(),
+        'title': row['title'],
+        'description': row['description'],
+        'length': float(row['length']),
+        'status': row['status'],
+        'fk_category': row['fk_category'].hex(),
+        'category_name': row['category_name'],
+        'front_page': row['front_page'],
+        'file': row['file'],
+        'favorite_count': row['favorite_count'],
+        'rating_stats': stats_to_dict(film_id, row if row['rating_count'] is not None else None)
+    })
+
+# Función Lambda para obtener una película
+def lambda_handler(event, context):
+    try:
+        film_id_hex = (event.get('pathParameters') or {}).get('film_id')
+        if not film_id_hex or not is_hex(film_id_hex):
+            return {
+                'statusCode': 400,
+                'body': json.dumps('Invalid film_id format')
+            }
+        film_id = bytes.fromhex(film_id_hex)
+        logger.info(f"Fetching film {film_id_hex}")
+
+        with db_connection.connect() as conn:
+            version = get_catalog_version(conn)
+            body = film_cache.get(version, film_id.hex())
+            if body is None:
+                body = fetch_film(conn, film_id)
+                if body is not None:
+                    film_cache.put(version, film_id.hex(), body)
+
+        if body is None:
+            return {
+                'statusCode': 404,
+                'body': json.dumps('Film not found')
+            }
+
+        headers = {'Content-Type': 'application/json', 'Cache-Control': f'max-age={DETAIL_TTL}'}
+        etag = etag_for(body)
+        if etag_matches(event, etag):
+            return not_modified(etag, headers)
+
+        headers['ETag'] = etag
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': body
+        }
+    except SQLAlchemyError as e:
+        logger.error(f"Error fetching film: {e}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Error fetching film')
+        }
@@ -0,0 +1,61 @@
+import logging
+import json
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sispe_common.db import create_db_engine
+from sispe_common.http import etag_for, etag_matches, not_modified
+from sispe_common.pagination import parse_id, parse_limit
+from sispe_common.serializer import dump_rows
+from sispe_common.tables import film_leaderboard, films
+
+# Configuración del logger
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Configuración de la base de datos
+db_connection = create_db_engine()
+
+# Función Lambda para obtener las películas mejor calificadas, opcionalmente por categoría
+def lambda_handler(event, context):
+    try:
+        params = event.get('queryStringParameters') or {}
+        limit = parse_limit(params)
+        fk_category = parse_id(params, 'fk_category')
+
+        # El ranking ya está calculado: se recorre el índice por score y se corta con LIMIT,
+        # así el tiempo de respuesta no depende del número de calificaciones
+        query = (select([films.c.film_id, films.c.title, films.c.front_page, film_leaderboard.c.fk_category,
+                         film_leaderboard.c.rating_count, film_leaderboard.c.score])
+                 .select_from(film_leaderboard.join(films, films.c.film_id == film_leaderboard.c.fk_film))
+                 .where(films.c.status == 'Activo'))
+        if fk_category is not None:
+            query = query.where(film_leaderboard.c.fk_category == fk_category)
+        query = query.order_by(film_leaderboard.c.score.desc(), film_leaderboard.c.fk_film).limit(limit)
+
+        with db_connection.connect() as conn:
+            body, _ = dump_rows(conn.execute(query), query.selected_columns)
+
+        etag = etag_for(body)
+        if etag_matches(event, etag):
+            return not_modified(etag)
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'ETag': etag
+            },
+            'body': body
+        }
+    except ValueError as e:
+        logger.error(f"Invalid query parameters: {e}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps(f'Invalid query parameters: {e}')
+        }
+    except SQLAlchemyError as e:
+        logger.error(f"Error fetching leaderboard: {e}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Error fetching leaderboard')
+        }
@@ -1,60 +1,85 @@
 import logging
 import json
-from sqlalchemy import create_engine, MetaData, Table, Column, BINARY, DECIMAL, VARCHAR
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
-from decimal import Decimal
+from sispe_common.db import create_db_engine
+from sispe_common.http import etag_for, etag_matches, not_modified
+from sispe_common.pagination import dump_page, parse_fields, parse_id, parse_limit
+from sispe_common.serializer import dump_rows
+from sispe_common.tables import rateings
 
 # Configuración del logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Configuración de la base de datos
-DB_USER = 'admin'
-DB_PASSWORD = 'nhL5zPpY1I9w'
-DB_NAME = 'sispe'
-DB_HOST = 'integradora-lambda.czc42euyq8iq.us-east-1.rds.amazonaws.com'
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-metadata = MetaData()
+db_connection = create_db_engine()
 
-# Definición de la tabla de rateings
-rateings = Table('rateings', metadata,
-                 Column('rateing_id', BINARY(16), primary_key=True),
-                 Column('grade', DECIMAL(2,1), nullable=False),
-                 Column('comment', VARCHAR(255)),
-                 Column('fk_user', BINARY(16)),
-                 Column('fk_film', BINARY(16)))
+# Columnas del rateing que se regresan y que se pueden pedir con fields=
+RATEING_COLUMNS = [column for column in rateings.c if column.name != 'previous_grade']
 
-# Función personalizada para manejar la conversión de tipos no serializables
-def custom_json_converter(obj):
-    if isinstance(obj, Decimal):
-        return float(obj)
-    if isinstance(obj, bytes):
-        return obj.hex()
-    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+# Consulta una página de rateings de una película y/o de un usuario. Se recorre
+# (fk_film, rateing_id) o (fk_user, rateing_id) hacia atrás, así que cada página
+# es una lectura acotada del índice sin importar cuántos rateings existan. rateing_id
+# es ordenado por tiempo (sispe_common.ids), así que las páginas van del más reciente al más antiguo
+def fetch_page(conn, limit, cursor, fk_film, fk_user, columns=RATEING_COLUMNS):
+    query = select(columns)
+    if fk_film is not None:
+        query = query.where(rateings.c.fk_film == fk_film)
+    if fk_user is not None:
+        query = query.where(rateings.c.fk_user == fk_user)
+    if cursor is not None:
+        query = query.where(rateings.c.rateing_id < cursor)
+    # Se pide una fila extra para saber si existe una página siguiente
+    query = query.order_by(rateings.c.rateing_id.desc()).limit(limit + 1)
+    rows = conn.execute(query).fetchall()
+    return dump_page(rows, query.selected_columns, limit, 'rateings', 'rateing_id')
 
 # Función Lambda para obtener todos los rateings
 def lambda_handler(event, context):
     try:
-        logger.info("Fetching rateings")
-        conn = db_connection.connect()
-        query = rateings.select()
-        result = conn.execute(query)
-        rateing_list = [
-            {column: custom_json_converter(value) if isinstance(value, (Decimal, bytes)) else value for column, value in row.items()}
-            for row in result
-        ]
-        conn.close()
+        params = event.get('queryStringParameters') or {}
+        fk_film = parse_id(params, 'fk_film')
+        fk_user = parse_id(params, 'fk_user')
+        scoped = fk_film is not None or fk_user is not None
+        if scoped:
+            limit = parse_limit(params)
+            cursor = parse_id(params, 'cursor')
+        # rateing_id es la llave del cursor de las páginas, así que se incluye aunque no se pida
+        columns = parse_fields(params, RATEING_COLUMNS, required=('rateing_id',) if scoped else ())
 
-        if not rateing_list:
+        with db_connection.connect() as conn:
+            if scoped:
+                logger.info(f"Fetching rateings page: fk_film={params.get('fk_film')} fk_user={params.get('fk_user')} limit={limit}")
+                body, rateing_count = fetch_page(conn, limit, cursor, fk_film, fk_user, columns)
+            else:
+                logger.info("Fetching rateings")
+                query = select(columns)
+                result = conn.execution_options(stream_results=True).execute(query)
+                body, rateing_count = dump_rows(result, query.selected_columns)
+
+        if not rateing_count:
             return {
                 'statusCode': 404,
                 'body': json.dumps('No rateings found')
             }
 
+        etag = etag_for(body)
+        if etag_matches(event, etag):
+            return not_modified(etag)
+
         return {
             'statusCode': 200,
-            'body': json.dumps(rateing_list)
+            'headers': {
+                'ETag': etag
+            },
+            'body': body
+        }
+    except ValueError as e:
+        logger.error(f"Invalid query parameters: {e}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps(f'Invalid query parameters: {e}')
         }
     except SQLAlchemyError as e:
         logger.error(f"Error fetching rateings: {e}")
@@ -0,0 +1,57 @@
+import logging
+import json
+from sqlalchemy.exc import SQLAlchemyError
+from sispe_common.db import create_db_engine
+from sispe_common.pagination import is_hex
+from sispe_common.rating_stats import stats_to_dict
+from sispe_common.tables import film_rating_stats
+
+# Configuración del logger
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Configuración de la base de datos
+db_connection = create_db_engine()
+
+MAX_FILMS = 100
+
+# Función Lambda para obtener los agregados de calificaciones de una o varias películas
+def lambda_handler(event, context):
+    try:
+        params = event.get('queryStringParameters') or {}
+        film_ids = [film_id.strip() for film_id in (params.get('fk_film') or '').split(',') if film_id.strip()]
+        if not film_ids:
+            return {
+                'statusCode': 400,
+                'body': json.dumps('fk_film is required')
+            }
+        if len(film_ids) > MAX_FILMS:
+            return {
+                'statusCode': 400,
+                'body': json.dumps(f'At most {MAX_FILMS} films per request')
+            }
+        if not all(is_hex(film_id) for film_id in film_ids):
+            return {
+                'statusCode': 400,
+                'body': json.dumps('Invalid fk_film')
+            }
+        film_ids = [bytes.fromhex(film_id) for film_id in film_ids]
+
+        # Una búsqueda por llave primaria por película, en una sola consulta
+        with db_connection.connect() as conn:
+            query = film_rating_stats.select().where(film_rating_stats.c.fk_film.in_(set(film_ids)))
+            stats = {row['fk_film']: row for row in conn.execute(query)}
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps([stats_to_dict(film_id, stats.get(film_id)) for film_id in film_ids])
+        }
+    except SQLAlchemyError as e:
+        logger.error(f"Error fetching rating stats: {e}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Error fetching rating stats')
+        }
@@ -1,49 +1,39 @@
 import json
 import logging
 import uuid
-from sqlalchemy import create_engine, MetaData, Table, Column, String, BINARY, DateTime
+from sqlalchemy import bindparam
 from sqlalchemy.exc import SQLAlchemyError
-import os
+from sispe_common.db import create_db_engine
+from sispe_common.tables import subscriptions
 from datetime import datetime
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-DB_USER = os.environ.get('DB_USER')
-DB_PASSWORD = os.environ.get('DB_PASSWORD')
-DB_NAME = os.environ.get('DB_NAME')
-DB_HOST = os.environ.get('DB_HOST')
+# Configuración de la base de datos
+db_connection = create_db_engine()
 
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-
-metadata = MetaData()
-subscriptions = Table('subscriptions', metadata,
-                        Column('subscription_id', BINARY(16), primary_key=True),
-                        Column('start_date', DateTime, nullable=False),
-                        Column('end_date', DateTime, nullable=False))
+# Sentencia armada una sola vez por contenedor; subscription_id llega como parámetro
+SELECT_SUBSCRIPTION = subscriptions.select().where(subscriptions.c.subscription_id == bindparam('subscription_id'))
 
 def lambda_handler(event, context):
     try:
         logger.info("Getting a subscription")
         subscription_id = event['pathParameters']['subscription_id']
 
-        conn = db_connection.connect()
-        query = subscriptions.select().where(subscriptions.c.subscription_id == uuid.UUID(subscription_id).bytes)
-        result = conn.execute(query).fetchone()
-
-        if result:
-            response = {
-                'subscription_id': str(uuid.UUID(bytes=result['subscription_id'])),
-                'start_date': result['start_date'].isoformat(),
-                'end_date': result['end_date'].isoformat()
-            }
-            status_code = 200
-        else:
-            response = {'message': 'Subscription not found'}
-            status_code = 404
-
-        conn.close()
+        with db_connection.connect() as conn:
+            result = conn.execute(SELECT_SUBSCRIPTION, {'subscription_id': uuid.UUID(subscription_id).bytes}).fetchone()
+
+            if result:
+                response = {
+                    'subscription_id': str(uuid.UUID(bytes=result['subscription_id'])),
+                    'start_date': result['start_date'].isoformat(),
+                    'end_date': result['end_date'].isoformat()
+                }
+                status_code = 200
+            else:
+                response = {'message': 'Subscription not found'}
+                status_code = 404
     except SQLAlchemyError as e:
         logger.error(f'Database error occurred: {e}')
         response = {'message': 'Internal Server Error'}
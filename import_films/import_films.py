@@ -0,0 +1,148 @@
+import logging
+import json
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sispe_common.catalog import bump_catalog_version
+from sispe_common.db import create_db_engine
+from sispe_common.http import request_header
+from sispe_common.ids import new_id
+from sispe_common.pagination import is_hex
+from sispe_common.tables import categories, films
+
+# Configuración del logger
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Configuración de la base de datos
+db_connection = create_db_engine()
+
+# Filas por executemany; pymysql las envía como un solo INSERT de varios VALUES
+CHUNK_SIZE = 1000
+MAX_FILMS = 20000
+FILM_STATUSES = ('Activo', 'Inactivo')
+# Longitud máxima de las columnas de texto, para rechazar la fila antes de que falle el lote
+TEXT_LIMITS = {'title': 60, 'description': 255, 'front_page': 255, 'file': 255}
+# length es DECIMAL(4,2): mayor que 0, menor que 100 y a lo más dos decimales
+MAX_LENGTH = Decimal('100')
+LENGTH_PRECISION = Decimal('0.01')
+
+# Acepta un arreglo JSON o NDJSON (una película por línea). En NDJSON una línea mal
+# formada se reporta como error de esa fila y no invalida el resto del cuerpo.
+def parse_items(event):
+    body = event.get('body') or ''
+    content_type = request_header(event, 'Content-Type') or ''
+    if 'ndjson' not in content_type and body.lstrip().startswith('['):
+        return json.loads(body)
+    items = []
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            items.append(ValueError(f'Invalid JSON format: {e.msg}'))
+    return items
+
+# Regresa la fila lista para insertar o lanza ValueError con el motivo del rechazo
+def validate_film(item):
+    if isinstance(item, Exception):
+        raise item
+    if not isinstance(item, dict):
+        raise ValueError('Each film must be a JSON object')
+    for key in ['title', 'description', 'length', 'status', 'fk_category', 'front_page', 'file']:
+        if key not in item:
+            raise ValueError(f'Missing required key: {key}')
+    for key, max_length in TEXT_LIMITS.items():
+        if not isinstance(item[key], str) or len(item[key]) > max_length:
+            raise ValueError(f'{key} must be a string of at most {max_length} characters')
+    if item['status'] not in FILM_STATUSES:
+        raise ValueError(f'status must be one of {", ".join(FILM_STATUSES)}')
+    if not is_hex(item['fk_category']):
+        raise ValueError('Invalid fk_category')
+    try:
+        length = Decimal(str(item['length']))
+    except InvalidOperation:
+        raise ValueError('length must be a number')
+    if not length.is_finite() or not 0 < length < MAX_LENGTH:
+        raise ValueError(f'length must be greater than 0 and less than {MAX_LENGTH}')
+    if length != length.quantize(LENGTH_PRECISION):
+        raise ValueError('length must have at most 2 decimal places')
+    return {
+        'film_id': new_id(),
+        'title': item['title'],
+        'description': item['description'],
+        'length': length,
+        'status': item['status'],
+        'fk_category': bytes.fromhex(item['fk_category']),
+        'front_page': item['front_page'],
+        'file': item['file']
+    }
+
+# Función Lambda para importar películas en bloque
+def lambda_handler(event, context):
+    try:
+        logger.info("Importing films")
+        items = parse_items(event)
+        if not isinstance(items, list) or not items:
+            return {
+                'statusCode': 400,
+                'body': json.dumps('Body must be a non-empty array or NDJSON of films')
+            }
+        if len(items) > MAX_FILMS:
+            return {
+                'statusCode': 400,
+                'body': json.dumps(f'At most {MAX_FILMS} films per request')
+            }
+
+        errors = []
+        valid = []
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, validate_film(item)))
+            except ValueError as e:
+                errors.append({'index': index, 'error': str(e)})
+
+        with db_connection.connect() as conn:
+
+            # Todas las categorías referenciadas se validan con una sola consulta IN
+            category_ids = {row['fk_category'] for _, row in valid}
+            existing_categories = set()
+            if category_ids:
+                query = select([categories.c.category_id]).where(categories.c.category_id.in_(category_ids))
+                existing_categories = {row[0] for row in conn.execute(query)}
+
+            film_rows = []
+            for index, row in valid:
+                if row['fk_category'] in existing_categories:
+                    film_rows.append(row)
+                else:
+                    errors.append({'index': index, 'error': 'Category ID does not exist'})
+
+            # Un executemany por bloque, todo dentro de una sola transacción
+            if film_rows:
+                with conn.begin():
+                    for start in range(0, len(film_rows), CHUNK_SIZE):
+                        conn.execute(films.insert(), film_rows[start:start + CHUNK_SIZE])
+                    bump_catalog_version(conn)
+
+        errors.sort(key=lambda error: error['index'])
+        return {
+            'statusCode': 200 if film_rows else 400,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps({'inserted': len(film_rows), 'errors': errors})
+        }
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON format: {e}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps('Invalid JSON format')
+        }
+    except SQLAlchemyError as e:
+        logger.error(f"Error importing films: {e}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Error importing films')
+        }
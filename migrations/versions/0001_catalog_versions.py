@@ -0,0 +1,27 @@
+"""catalog_versions: versión del catálogo de películas para el snapshot de GET /films
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    catalog_versions = op.create_table('catalog_versions',
+                                       sa.Column('catalog', sa.String(45), primary_key=True),
+                                       sa.Column('version', sa.BigInteger, nullable=False))
+    op.bulk_insert(catalog_versions, [{'catalog': 'films', 'version': 1}])
+
+
+def downgrade():
+    op.drop_table('catalog_versions')
@@ -0,0 +1,26 @@
+"""films_title_description_ft: índice FULLTEXT para la búsqueda de películas
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # En SQLite las pruebas usan FTS5 (tests.unit.db_utils.create_fts5_search_index)
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('films_title_description_ft', 'films', ['title', 'description'], mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('films_title_description_ft', table_name='films')
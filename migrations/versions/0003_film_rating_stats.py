@@ -0,0 +1,36 @@
+"""film_rating_stats: agregados de calificaciones por película
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+GRADE_BUCKETS = 10
+
+
+def upgrade():
+    op.create_table('film_rating_stats',
+                    sa.Column('fk_film', sa.BINARY(16), primary_key=True),
+                    sa.Column('rating_count', sa.Integer, nullable=False),
+                    sa.Column('grade_sum', sa.DECIMAL(12, 1), nullable=False),
+                    *[sa.Column(f'bucket_{n}', sa.Integer, nullable=False) for n in range(GRADE_BUCKETS)])
+    # Se calculan los agregados de las calificaciones que ya existen
+    buckets = ', '.join(f'bucket_{n}' for n in range(GRADE_BUCKETS))
+    bucket_sums = ', '.join(f'SUM(CASE WHEN grade >= {n} AND grade < {n + 1} THEN 1 ELSE 0 END)'
+                            for n in range(GRADE_BUCKETS))
+    op.execute(f'INSERT INTO film_rating_stats (fk_film, rating_count, grade_sum, {buckets}) '
+               f'SELECT fk_film, COUNT(*), SUM(grade), {bucket_sums} FROM rateings GROUP BY fk_film')
+
+
+def downgrade():
+    op.drop_table('film_rating_stats')
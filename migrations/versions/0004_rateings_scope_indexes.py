@@ -0,0 +1,25 @@
+"""rateings: índices para consultar por película y por usuario
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('rateings_film_idx', 'rateings', ['fk_film', 'rateing_id'])
+    op.create_index('rateings_user_idx', 'rateings', ['fk_user', 'rateing_id'])
+
+
+def downgrade():
+    op.drop_index('rateings_user_idx', table_name='rateings')
+    op.drop_index('rateings_film_idx', table_name='rateings')
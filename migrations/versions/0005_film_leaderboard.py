@@ -0,0 +1,47 @@
+"""film_leaderboard: ranking bayesiano precalculado y su prior
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+PRIOR_WEIGHT = 10.0
+DEFAULT_PRIOR_MEAN = 5.0
+
+
+def upgrade():
+    op.create_table('rating_priors',
+                    sa.Column('prior_id', sa.Integer, primary_key=True, autoincrement=False),
+                    sa.Column('prior_mean', sa.Float, nullable=False),
+                    sa.Column('prior_weight', sa.Float, nullable=False))
+    op.create_table('film_leaderboard',
+                    sa.Column('fk_film', sa.BINARY(16), primary_key=True),
+                    sa.Column('fk_category', sa.BINARY(16), nullable=False),
+                    sa.Column('rating_count', sa.Integer, nullable=False),
+                    sa.Column('score', sa.Float, nullable=False))
+    op.create_index('film_leaderboard_score_idx', 'film_leaderboard', ['score'])
+    op.create_index('film_leaderboard_category_score_idx', 'film_leaderboard', ['fk_category', 'score'])
+    # Prior inicial con el promedio global y ranking de las películas ya calificadas
+    op.execute(f'INSERT INTO rating_priors (prior_id, prior_mean, prior_weight) '
+               f'SELECT 1, COALESCE(SUM(grade_sum) / NULLIF(SUM(rating_count), 0), {DEFAULT_PRIOR_MEAN}), {PRIOR_WEIGHT} '
+               f'FROM film_rating_stats')
+    op.execute('INSERT INTO film_leaderboard (fk_film, fk_category, rating_count, score) '
+               'SELECT s.fk_film, f.fk_category, s.rating_count, '
+               '(p.prior_weight * p.prior_mean + s.grade_sum) / (p.prior_weight + s.rating_count) '
+               'FROM film_rating_stats s JOIN films f ON f.film_id = s.fk_film '
+               'JOIN rating_priors p ON p.prior_id = 1 WHERE s.rating_count > 0')
+
+
+def downgrade():
+    op.drop_table('film_leaderboard')
+    op.drop_table('rating_priors')
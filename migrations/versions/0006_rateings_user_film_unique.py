@@ -0,0 +1,39 @@
+"""rateings: un solo rateing por usuario y película
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+GRADE_BUCKETS = 10
+
+
+def upgrade():
+    # Se conserva un rateing por (fk_user, fk_film) y se descartan los duplicados
+    op.execute('DELETE FROM rateings WHERE rateing_id NOT IN ('
+               'SELECT keep_id FROM (SELECT MAX(rateing_id) AS keep_id FROM rateings '
+               'GROUP BY fk_user, fk_film) AS keep_rateings)')
+    with op.batch_alter_table('rateings') as batch_op:
+        batch_op.create_unique_constraint('rateings_user_film_uq', ['fk_user', 'fk_film'])
+    # Los agregados se recalculan sin los duplicados; el ranking se reconstruye en el
+    # siguiente refresco programado
+    buckets = ', '.join(f'bucket_{n}' for n in range(GRADE_BUCKETS))
+    bucket_sums = ', '.join(f'SUM(CASE WHEN grade >= {n} AND grade < {n + 1} THEN 1 ELSE 0 END)'
+                            for n in range(GRADE_BUCKETS))
+    op.execute('DELETE FROM film_rating_stats')
+    op.execute(f'INSERT INTO film_rating_stats (fk_film, rating_count, grade_sum, {buckets}) '
+               f'SELECT fk_film, COUNT(*), SUM(grade), {bucket_sums} FROM rateings GROUP BY fk_film')
+
+
+def downgrade():
+    with op.batch_alter_table('rateings') as batch_op:
+        batch_op.drop_constraint('rateings_user_film_uq', type_='unique')
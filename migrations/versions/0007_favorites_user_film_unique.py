@@ -0,0 +1,29 @@
+"""favorites: una sola fila por usuario y película
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Se conserva un favorito por (fk_user, fk_film) y se descartan los duplicados
+    op.execute('DELETE FROM favorites WHERE favorite_id NOT IN ('
+               'SELECT keep_id FROM (SELECT MAX(favorite_id) AS keep_id FROM favorites '
+               'GROUP BY fk_user, fk_film) AS keep_favorites)')
+    with op.batch_alter_table('favorites') as batch_op:
+        batch_op.create_unique_constraint('favorites_user_film_uq', ['fk_user', 'fk_film'])
+
+
+def downgrade():
+    with op.batch_alter_table('favorites') as batch_op:
+        batch_op.drop_constraint('favorites_user_film_uq', type_='unique')
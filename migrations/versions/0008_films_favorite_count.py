@@ -0,0 +1,29 @@
+"""films: contador desnormalizado de favoritos
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('films', sa.Column('favorite_count', sa.Integer, nullable=False, server_default='0'))
+    op.execute('UPDATE films SET favorite_count = '
+               '(SELECT COUNT(*) FROM favorites WHERE favorites.fk_film = films.film_id)')
+    op.create_index('films_popular_idx', 'films', ['favorite_count', 'film_id'])
+
+
+def downgrade():
+    op.drop_index('films_popular_idx', table_name='films')
+    with op.batch_alter_table('films') as batch_op:
+        batch_op.drop_column('favorite_count')
@@ -0,0 +1,60 @@
+"""Índices para las consultas de los handlers, creados solo si faltan
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+# (nombre, tabla, columnas, único). Algunos ya los crean migraciones anteriores (0004, 0007)
+# o existen en bases creadas a mano; se revisan igual para que cada base termine con el paquete
+# completo sin importar de dónde venga
+INDEXES = [
+    ('favorites_user_film_uq', 'favorites', ['fk_user', 'fk_film'], True),
+    # delete_film borra los favoritos por película; la llave única empieza por fk_user
+    ('favorites_film_idx', 'favorites', ['fk_film'], False),
+    ('rateings_film_idx', 'rateings', ['fk_film', 'rateing_id'], False),
+    ('rateings_user_idx', 'rateings', ['fk_user', 'rateing_id'], False),
+    ('films_status_category_idx', 'films', ['status', 'fk_category'], False),
+    ('users_email_idx', 'users', ['email'], False),
+    ('subscriptions_end_date_idx', 'subscriptions', ['end_date'], False),
+]
+
+# Los que crea esta migración; downgrade solo borra estos
+OWN_INDEXES = ('favorites_film_idx', 'films_status_category_idx', 'users_email_idx',
+               'subscriptions_end_date_idx')
+
+
+# Un índice existente sirve si sus primeras columnas son las buscadas (y es único cuando se
+# pide unicidad); la llave primaria y las llaves únicas también cuentan
+def has_index(inspector, table, columns, unique):
+    candidates = [(index['column_names'], index.get('unique', False)) for index in inspector.get_indexes(table)]
+    candidates += [(constraint['column_names'], True) for constraint in inspector.get_unique_constraints(table)]
+    candidates.append((inspector.get_pk_constraint(table)['constrained_columns'], True))
+    return any(names[:len(columns)] == columns and (is_unique or not unique) for names, is_unique in candidates)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for name, table, columns, unique in INDEXES:
+        if table in tables and not has_index(inspector, table, columns, unique):
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for name, table, _, _ in INDEXES:
+        if name in OWN_INDEXES and table in tables \
+                and name in {index['name'] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,25 @@
+"""rateings: nota anterior al último reenvío
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('rateings', sa.Column('previous_grade', sa.DECIMAL(2, 1), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('rateings') as batch_op:
+        batch_op.drop_column('previous_grade')
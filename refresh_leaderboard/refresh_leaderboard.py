@@ -0,0 +1,37 @@
+import logging
+import json
+import os
+from sqlalchemy.exc import SQLAlchemyError
+from sispe_common.db import create_db_engine
+from sispe_common.leaderboard import DEFAULT_PRIOR_WEIGHT, refresh_all
+
+# Configuración del logger
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Configuración de la base de datos
+db_connection = create_db_engine()
+
+# Peso del prior: cuántas calificaciones "promedio" se suman a cada película
+PRIOR_WEIGHT = float(os.environ.get('LEADERBOARD_PRIOR_WEIGHT', DEFAULT_PRIOR_WEIGHT))
+
+# Función Lambda programada que recalcula el prior y reconstruye el ranking completo.
+# Las escrituras de rateings ya actualizan cada película; este refresco corrige el
+# desfase que acumula el prior global entre ejecuciones.
+def lambda_handler(event, context):
+    try:
+        logger.info("Refreshing leaderboard")
+        with db_connection.connect() as conn:
+            with conn.begin():
+                prior_mean, prior_weight, ranked = refresh_all(conn, PRIOR_WEIGHT)
+        logger.info(f"Leaderboard refreshed: {ranked} films, prior_mean={prior_mean:.3f}")
+        return {
+            'statusCode': 200,
+            'body': json.dumps({'ranked': ranked, 'prior_mean': prior_mean, 'prior_weight': prior_weight})
+        }
+    except SQLAlchemyError as e:
+        logger.error(f"Error refreshing leaderboard: {e}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Error refreshing leaderboard')
+        }
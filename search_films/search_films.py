@@ -0,0 +1,98 @@
+import logging
+import json
+import re
+from io import StringIO
+from sqlalchemy import Float, select, literal_column, type_coerce
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import SQLAlchemyError
+from sispe_common.db import create_db_engine
+from sispe_common.pagination import parse_id, parse_limit, parse_offset
+from sispe_common.serializer import write_rows
+from sispe_common.tables import films
+
+# Configuración del logger
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Configuración de la base de datos
+db_connection = create_db_engine()
+
+MAX_OFFSET = 1000
+FILM_STATUSES = ('Activo', 'Inactivo')
+
+# Lee q, filtros y paginación de la query string; lanza ValueError si alguno no es válido
+def parse_query_params(params):
+    q = (params.get('q') or '').strip()
+    if not q:
+        raise ValueError('q is required')
+    if not re.search(r'\w', q):
+        raise ValueError('q must contain at least one word')
+
+    limit = parse_limit(params)
+    offset = parse_offset(params, MAX_OFFSET)
+
+    status = params.get('status')
+    if status is not None and status not in FILM_STATUSES:
+        raise ValueError(f'status must be one of {", ".join(FILM_STATUSES)}')
+
+    fk_category = parse_id(params, 'fk_category')
+
+    return q, limit, offset, status, fk_category
+
+# MATCH ... AGAINST en lenguaje natural sobre el índice FULLTEXT de MySQL: las películas que
+# coinciden con q y su relevancia como columna score
+def relevance_query(q):
+    score = match(films.c.title, films.c.description, against=q).in_natural_language_mode()
+    return select([films, type_coerce(score, Float).label('score')]).where(score)
+
+def search_query(q, limit, offset, status, fk_category):
+    query = relevance_query(q)
+    if status is not None:
+        query = query.where(films.c.status == status)
+    if fk_category is not None:
+        query = query.where(films.c.fk_category == fk_category)
+    # Se pide una fila extra para saber si existe una página siguiente
+    return query.order_by(literal_column('score').desc(), films.c.film_id).limit(limit + 1).offset(offset)
+
+# Función Lambda para buscar películas por título y descripción
+def lambda_handler(event, context):
+    try:
+        logger.info("Searching films")
+        params = event.get('queryStringParameters') or {}
+        q, limit, offset, status, fk_category = parse_query_params(params)
+
+        with db_connection.connect() as conn:
+            query = search_query(q, limit, offset, status, fk_category)
+            rows = conn.execute(query).fetchall()
+
+        next_offset = offset + limit if len(rows) > limit and offset + limit <= MAX_OFFSET else None
+        body = StringIO()
+        body.write('{"films": ')
+        write_rows(body, rows[:limit], query.selected_columns)
+        body.write(', "next_offset": ' + json.dumps(next_offset) + '}')
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': body.getvalue()
+        }
+    except ValueError as e:
+        logger.error(f"Invalid query parameters: {e}")
+        return {
+            'statusCode': 400,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps(f'Invalid query parameters: {e}')
+        }
+    except SQLAlchemyError as e:
+        logger.error(f"Error searching films: {e}")
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps('Error searching films')
+        }
@@ -0,0 +1,96 @@
+import logging
+import json
+import os
+import time
+import unicodedata
+from bisect import bisect_left
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sispe_common.catalog import get_catalog_version
+from sispe_common.db import create_db_engine
+from sispe_common.pagination import parse_limit
+from sispe_common.tables import films
+
+# Configuración del logger
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Configuración de la base de datos
+db_connection = create_db_engine()
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 20
+# Cada cuántos segundos, como máximo, se consulta la versión del catálogo
+REFRESH_INTERVAL = float(os.environ.get('SUGGEST_REFRESH_SECONDS', '5'))
+
+# Títulos activos con los que se arma el índice; la sentencia se arma una sola vez por contenedor
+SELECT_ACTIVE_TITLES = select([films.c.film_id, films.c.title]).where(films.c.status == 'Activo')
+
+# Índice de prefijos del contenedor: títulos normalizados ordenados y, en listas
+# paralelas, el título original y el film_id de cada uno
+suggest_index = {'version': None, 'checked_at': 0.0, 'keys': [], 'titles': [], 'ids': []}
+
+# Minúsculas, sin acentos y con los espacios colapsados
+def normalize(title):
+    decomposed = unicodedata.normalize('NFKD', title)
+    return ' '.join(''.join(c for c in decomposed if not unicodedata.combining(c)).lower().split())
+
+def build_prefix_index(rows):
+    entries = sorted((normalize(title), title, film_id) for film_id, title in rows)
+    return [entry[0] for entry in entries], [entry[1] for entry in entries], [entry[2] for entry in entries]
+
+# Búsqueda binaria del primer título con el prefijo y recorrido mientras siga coincidiendo
+def lookup(index, prefix, limit):
+    keys = index['keys']
+    position = bisect_left(keys, prefix)
+    matches = []
+    while position < len(keys) and len(matches) < limit and keys[position].startswith(prefix):
+        matches.append({'film_id': index['ids'][position].hex(), 'title': index['titles'][position]})
+        position += 1
+    return matches
+
+# Reconstruye el índice solo cuando cambió la versión del catálogo
+def refresh_index(conn):
+    version = get_catalog_version(conn)
+    if version != suggest_index['version']:
+        rows = conn.execute(SELECT_ACTIVE_TITLES)
+        keys, titles, ids = build_prefix_index(rows)
+        suggest_index.update(version=version, keys=keys, titles=titles, ids=ids)
+        logger.info(f"Suggest index rebuilt with {len(keys)} titles for catalog version {version}")
+    suggest_index['checked_at'] = time.monotonic()
+
+# Función Lambda para sugerir títulos de películas mientras el usuario escribe
+def lambda_handler(event, context):
+    try:
+        params = event.get('queryStringParameters') or {}
+        prefix = normalize(params.get('q') or '')
+        if not prefix:
+            return {
+                'statusCode': 400,
+                'body': json.dumps('q is required')
+            }
+        try:
+            limit = parse_limit(params, default=DEFAULT_LIMIT, maximum=MAX_LIMIT)
+        except ValueError as e:
+            return {
+                'statusCode': 400,
+                'body': json.dumps(str(e))
+            }
+
+        if suggest_index['version'] is None or time.monotonic() - suggest_index['checked_at'] >= REFRESH_INTERVAL:
+            with db_connection.connect() as conn:
+                refresh_index(conn)
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps({'suggestions': lookup(suggest_index, prefix, limit)})
+        }
+    except SQLAlchemyError as e:
+        logger.error(f"Error loading film titles: {e}")
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Error fetching suggestions')
+        }
@@ -0,0 +1,159 @@
+import logging
+import json
+from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.sql import select
+from sispe_common.db import create_db_engine
+from sispe_common.favorite_counts import change_favorite_count
+from sispe_common.ids import new_id
+from sispe_common.pagination import is_hex
+from sispe_common.tables import favorites, films, users
+
+# Configuración del logger
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Configuración de la base de datos
+db_connection = create_db_engine()
+
+# Películas por solicitud, sumando las que se agregan y las que se quitan
+MAX_FILMS = 500
+
+# Aplica los cambios de favoritos de un usuario. Sin importar cuántas películas traiga la
+# solicitud el número de sentencias es fijo: las películas a agregar (un IN), los favoritos
+# actuales (un IN), un INSERT múltiple, un DELETE con IN y un UPDATE del contador por cada uno.
+def sync_favorites(conn, user_id, add_ids, remove_ids):
+    statuses = {}
+    add_films = {}
+    if add_ids:
+        query = select([films.c.film_id, films.c.status]).where(films.c.film_id.in_(add_ids))
+        add_films = {row['film_id']: row['status'] for row in conn.execute(query)}
+
+    with conn.begin():
+        query = select([favorites.c.fk_film]).where(
+            and_(
+                favorites.c.fk_user == user_id,
+                favorites.c.fk_film.in_(add_ids + remove_ids)
+            )
+        ).with_for_update()
+        current = {row['fk_film'] for row in conn.execute(query)}
+
+        new_favorites = []
+        for film_id in add_ids:
+            if film_id in current:
+                statuses[film_id] = 'already_favorite'
+            elif film_id not in add_films:
+                statuses[film_id] = 'film_not_found'
+            elif add_films[film_id] != 'Activo':
+                statuses[film_id] = 'film_inactive'
+            else:
+                statuses[film_id] = 'added'
+                new_favorites.append({'favorite_id': new_id(), 'fk_user': user_id, 'fk_film': film_id})
+        if new_favorites:
+            conn.execute(favorites.insert(), new_favorites)
+            change_favorite_count(conn, [favorite['fk_film'] for favorite in new_favorites], 1)
+
+        removed = [film_id for film_id in remove_ids if film_id in current]
+        for film_id in remove_ids:
+            statuses[film_id] = 'removed' if film_id in current else 'not_favorite'
+        if removed:
+            conn.execute(favorites.delete().where(
+                and_(
+                    favorites.c.fk_user == user_id,
+                    favorites.c.fk_film.in_(removed)
+                )
+            ))
+            change_favorite_count(conn, removed, -1)
+    return statuses
+
+# Función Lambda para sincronizar en lote los favoritos agregados y quitados por un usuario
+def lambda_handler(event, context):
+    try:
+        if event.get('body') is None:
+            return {
+                'statusCode': 400,
+                'body': json.dumps('Entrada invalida, cuerpo no encontrado')
+            }
+
+        logger.info("Syncing favorites")
+        data = json.loads(event['body'])
+        if not isinstance(data, dict):
+            return {
+                'statusCode': 400,
+                'body': json.dumps('El cuerpo debe ser un objeto JSON')
+            }
+        fk_user = data.get('fk_user')
+        add = data.get('add') or []
+        remove = data.get('remove') or []
+
+        if not is_hex(fk_user):
+            return {
+                'statusCode': 400,
+                'body': json.dumps('El ID de usuario no es válido')
+            }
+        if not isinstance(add, list) or not isinstance(remove, list):
+            return {
+                'statusCode': 400,
+                'body': json.dumps('add y remove deben ser listas de IDs de película')
+            }
+        if len(add) + len(remove) > MAX_FILMS:
+            return {
+                'statusCode': 400,
+                'body': json.dumps(f'Máximo {MAX_FILMS} películas por solicitud')
+            }
+        if {str(film_id).lower() for film_id in add} & {str(film_id).lower() for film_id in remove}:
+            return {
+                'statusCode': 400,
+                'body': json.dumps('Una película no puede agregarse y quitarse en la misma solicitud')
+            }
+
+        # Los IDs inválidos se reportan por película y no detienen el resto del lote
+        results = []
+        add_ids, remove_ids = [], []
+        for action, film_ids, valid_ids in (('add', add, add_ids), ('remove', remove, remove_ids)):
+            for fk_film in film_ids:
+                if is_hex(fk_film):
+                    film_id = bytes.fromhex(fk_film)
+                    if film_id not in valid_ids:
+                        valid_ids.append(film_id)
+                results.append({'fk_film': fk_film, 'action': action})
+
+        user_id = bytes.fromhex(fk_user)
+        with db_connection.connect() as conn:
+            user_exists = conn.execute(select([users.c.user_id]).where(users.c.user_id == user_id)).fetchone()
+            if user_exists is None:
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps('Usuario no encontrado')
+                }
+
+            statuses = sync_favorites(conn, user_id, add_ids, remove_ids) if add_ids or remove_ids else {}
+
+        for result in results:
+            fk_film = result['fk_film']
+            result['status'] = statuses[bytes.fromhex(fk_film)] if is_hex(fk_film) else 'invalid_id'
+            result['fk_film'] = fk_film.lower() if is_hex(fk_film) else fk_film
+
+        return {
+            'statusCode': 200,
+            'body': json.dumps({'fk_user': fk_user.lower(), 'results': results})
+        }
+
+    except IntegrityError as e:
+        logger.error(f'Concurrent favorite change: {e}')
+        return {
+            'statusCode': 409,
+            'body': json.dumps('Los favoritos cambiaron durante la sincronización, intente de nuevo')
+        }
+    except SQLAlchemyError as e:
+        logger.error(f'Error syncing favorites: {e}')
+        return {
+            'statusCode': 500,
+            'body': json.dumps('Error al sincronizar favoritos')
+        }
+    except json.JSONDecodeError as e:
+        logger.error(f'Invalid JSON format: {e}')
+        return {
+            'statusCode': 400,
+            'body': json.dumps('Formato JSON inválido')
+        }
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# En Lambda el layer común se monta en /opt/python; localmente se agrega al path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'common', 'python'))
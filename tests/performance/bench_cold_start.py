@@ -0,0 +1,186 @@
+"""Arranque en frío de cada handler: tiempo de import y de la primera invocación.
+
+Cada handler se importa en un proceso nuevo, como en un contenedor de Lambda recién
+creado. Se cuentan los intentos de conexión a la base de datos durante el import:
+un handler no debe conectarse antes de recibir un evento (p. ej. por autoload_with).
+La primera invocación recibe un evento válido contra SQLite en memoria con datos de
+prueba, así que mide el trabajo diferido a la primera llamada (compilación de sentencias,
+primeras consultas), no la red. Cognito se sustituye con un mock y search_films usa el
+índice FTS5 de las pruebas en lugar de MATCH ... AGAINST.
+
+Uso: python -m tests.performance.bench_cold_start [--max-import-ms N] [handler ...]
+Termina con código 1 si algún handler se conecta al importarse, excede --max-import-ms, lanza
+una excepción o no responde 2xx.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+COMMON = os.path.join(ROOT, 'common', 'python')
+
+CATEGORY = bytes([1]) * 16
+USER = bytes([2]) * 16
+FILM = bytes([3]) * 16
+SUBSCRIPTION = bytes([4]) * 16
+ROL = bytes([5]) * 16
+RATEING = bytes([6]) * 16
+FAVORITE = bytes([7]) * 16
+OTHER_FILM = bytes([8]) * 16
+EMPTY_CATEGORY = bytes([9]) * 16
+
+
+def seed(conn):
+    from sispe_common import tables
+    from tests.unit.db_utils import create_fts5_search_index, film_row
+
+    create_fts5_search_index(conn)
+    conn.execute(tables.categories.insert(), [{'category_id': CATEGORY, 'name': 'Drama'},
+                                              {'category_id': EMPTY_CATEGORY, 'name': 'Vacía'}])
+    conn.execute(tables.films.insert(), [film_row(FILM, fk_category=CATEGORY),
+                                         film_row(OTHER_FILM, title='Film 2', fk_category=CATEGORY)])
+    conn.execute(tables.subscriptions.insert().values(
+        subscription_id=SUBSCRIPTION, start_date=datetime(2026, 1, 1), end_date=datetime(2027, 1, 1)))
+    conn.execute(tables.users.insert().values(
+        user_id=USER, name='Ana', lastname='Ruiz', email='ana@example.com', password='x',
+        fk_rol=ROL, fk_subscription=SUBSCRIPTION))
+    conn.execute(tables.favorites.insert().values(favorite_id=FAVORITE, fk_user=USER, fk_film=FILM))
+    conn.execute(tables.rateings.insert().values(rateing_id=RATEING, grade=5, fk_user=USER, fk_film=FILM))
+
+
+# Un evento válido por handler, para que la primera invocación llegue a la base de datos
+def handler_event(name):
+    from tests.unit.db_utils import film_row, hex_row
+
+    new_film = {key: value for key, value in hex_row(film_row(FILM, fk_category=CATEGORY)).items()
+                if key != 'film_id'}
+    start_date = datetime.now() + timedelta(days=1)
+    user = {'name': 'Luis', 'lastname': 'Mora', 'email': 'luis@example.com', 'password': 'x',
+            'fk_rol': ROL.hex(), 'fk_subscription': SUBSCRIPTION.hex()}
+    rateing = {'grade': 8.0, 'fk_user': USER.hex(), 'fk_film': FILM.hex()}
+    events = {
+        'batch_get': {'pathParameters': {'entity': 'films'}, 'body': json.dumps({'ids': [FILM.hex()]})},
+        'create_category': {'body': json.dumps({'name': 'Comedia'})},
+        'create_favorite': {'body': json.dumps({'fk_user': USER.hex(), 'fk_film': OTHER_FILM.hex()})},
+        'create_film': {'body': json.dumps(new_film)},
+        'create_rateing': {'body': json.dumps(rateing)},
+        'create_subscription': {'body': json.dumps({'start_date': start_date.isoformat(),
+                                                    'end_date': (start_date + timedelta(days=30)).isoformat()})},
+        'create_user': {'body': json.dumps(user)},
+        'delete_category': {'pathParameters': {'category_id': EMPTY_CATEGORY.hex()}},
+        'delete_favorite': {'body': json.dumps({'fk_user': USER.hex(), 'fk_film': FILM.hex()})},
+        'delete_film': {'pathParameters': {'film_id': FILM.hex()}},
+        'delete_rateing': {'pathParameters': {'id': RATEING.hex()}},
+        'delete_user': {'pathParameters': {'user_id': USER.hex()}},
+        'get_categories': {},
+        'get_favorites': {'pathParameters': {'fk_user': USER.hex()}},
+        'get_film': {'pathParameters': {'film_id': FILM.hex()}},
+        'get_films': {'queryStringParameters': {'limit': '10'}},
+        'get_leaderboard': {'queryStringParameters': None},
+        'get_rateing': {'queryStringParameters': {'fk_film': FILM.hex()}},
+        'get_rating_stats': {'queryStringParameters': {'fk_film': FILM.hex()}},
+        'get_subscription': {'pathParameters': {'subscription_id': SUBSCRIPTION.hex()}},
+        'get_user': {'queryStringParameters': None},
+        'import_films': {'body': json.dumps([new_film])},
+        'refresh_leaderboard': {},
+        'search_films': {'queryStringParameters': {'q': 'film'}},
+        'suggest_films': {'queryStringParameters': {'q': 'fi'}},
+        'sync_favorites': {'body': json.dumps({'fk_user': USER.hex(), 'add': [OTHER_FILM.hex()],
+                                               'remove': [FILM.hex()]})},
+        'update_category': {'pathParameters': {'category_id': CATEGORY.hex()}, 'body': json.dumps({'name': 'Drama'})},
+        'update_film': {'body': json.dumps(hex_row(film_row(FILM, title='Nuevo', fk_category=CATEGORY)))},
+        'update_rateing': {'pathParameters': {'id': RATEING.hex()}, 'body': json.dumps(rateing)},
+        'update_user': {'body': json.dumps({'user_id': USER.hex(), **user})},
+    }
+    return events[name]
+
+
+def handler_names():
+    return sorted(name for name in os.listdir(ROOT)
+                  if os.path.isfile(os.path.join(ROOT, name, f'{name}.py'))
+                  and os.path.isfile(os.path.join(ROOT, name, '__init__.py')))
+
+
+# Se ejecuta en el proceso hijo: importa un handler e invoca lambda_handler una vez
+def measure(name):
+    sys.path.insert(0, COMMON)
+    sys.path.insert(0, ROOT)
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from tests.unit.db_utils import fts5_relevance_query, sqlite_engine
+
+    connects = []
+    event.listen(Engine, 'do_connect', lambda *args: connects.append(1))
+
+    result = {'handler': name}
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(f'{name}.{name}')
+    except Exception as e:
+        result.update(import_ms=(time.perf_counter() - start) * 1000, connects_at_import=len(connects),
+                      error=f'{type(e).__name__}: {e}'.splitlines()[0])
+        return result
+    result.update(import_ms=(time.perf_counter() - start) * 1000, connects_at_import=len(connects))
+
+    from sispe_common import tables
+    module.db_connection = sqlite_engine(tables.metadata)
+    with module.db_connection.begin() as conn:
+        seed(conn)
+    if name == 'create_user':
+        patch.object(module.boto3, 'client').start()
+    if name == 'search_films':
+        patch.object(module, 'relevance_query', fts5_relevance_query).start()
+    event = handler_event(name)
+    start = time.perf_counter()
+    try:
+        status = module.lambda_handler(event, None).get('statusCode')
+    except Exception as e:
+        status = type(e).__name__
+    result.update(invoke_ms=(time.perf_counter() - start) * 1000, status=status)
+    return result
+
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ['--child']:
+        print(json.dumps(measure(args[1])))
+        return 0
+
+    max_import_ms = None
+    if args[:1] == ['--max-import-ms']:
+        max_import_ms = float(args[1])
+        args = args[2:]
+    names = args or handler_names()
+
+    failed = False
+    print(f'{"handler":<22} {"import ms":>10} {"connects":>9} {"1st call ms":>12} {"status":>7}')
+    for name in names:
+        output = subprocess.run([sys.executable, '-m', 'tests.performance.bench_cold_start', '--child', name],
+                                cwd=ROOT, capture_output=True, text=True, env=dict(os.environ, DB_HOST='127.0.0.1:1'))
+        lines = output.stdout.strip().splitlines()
+        if output.returncode or not lines:
+            print(f'{name:<22} failed: {output.stderr.strip().splitlines()[-1:]}')
+            failed = True
+            continue
+        result = json.loads(lines[-1])
+        if 'error' in result:
+            print(f'{name:<22} {result["import_ms"]:>10.1f} {result["connects_at_import"]:>9} {result["error"]}')
+            failed = True
+            continue
+        print(f'{name:<22} {result["import_ms"]:>10.1f} {result["connects_at_import"]:>9} '
+              f'{result["invoke_ms"]:>12.1f} {str(result["status"]):>7}')
+        if result['connects_at_import'] or (max_import_ms is not None and result['import_ms'] > max_import_ms):
+            failed = True
+        # Un error o una respuesta que no es 2xx no llegó a medir la primera consulta
+        if not isinstance(result['status'], int) or not 200 <= result['status'] < 300:
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
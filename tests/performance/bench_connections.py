@@ -0,0 +1,122 @@
+"""Latencia de invocaciones calientes y conexiones abiertas según la configuración del engine.
+
+Simula contenedores de Lambda como hilos, cada uno con su propio engine, que atienden
+invocaciones una tras otra (conectar, SELECT 1, cerrar). Compara:
+  before: create_engine con los valores por defecto, como estaban los handlers
+  pool:   sispe_common.db en modo pool (una conexión por contenedor, ping, recycle)
+  proxy:  sispe_common.db en modo proxy (NullPool; una conexión nueva por invocación)
+Reporta p50/p99 por invocación, conexiones abiertas en total y el máximo abierto a la vez.
+
+Con DB_URL apuntando a MySQL, --stale baja el wait_timeout de cada sesión a 1 s y deja
+pasar 2 s entre algunas invocaciones, como un contenedor congelado: se cuentan los errores.
+Sin DB_URL se usa SQLite en archivo, donde abrir una conexión casi no cuesta y donde before
+no reutiliza conexiones (el pool por defecto de SQLite en archivo es NullPool, no QueuePool).
+
+Uso: [DB_URL=mysql+pymysql://...] python -m tests.performance.bench_connections
+     [--containers N] [--invocations N] [--stale]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'common', 'python'))
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.exc import SQLAlchemyError  # noqa: E402
+from sispe_common.db import create_db_engine  # noqa: E402
+
+MODES = ('before', 'pool', 'proxy')
+STALE_EVERY = 50
+
+
+def build_engine(mode, url):
+    if mode == 'before':
+        return create_engine(url)
+    os.environ['DB_POOL_MODE'] = mode
+    return create_db_engine(url)
+
+
+class Counter:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.opened = 0
+        self.open_now = 0
+        self.peak = 0
+
+    def track(self, engine, stale):
+        @event.listens_for(engine, 'connect')
+        def on_connect(dbapi_connection, connection_record):
+            with self.lock:
+                self.opened += 1
+                self.open_now += 1
+                self.peak = max(self.peak, self.open_now)
+            if stale:
+                cursor = dbapi_connection.cursor()
+                cursor.execute('SET SESSION wait_timeout = 1')
+                cursor.close()
+
+        @event.listens_for(engine, 'close')
+        def on_close(dbapi_connection, connection_record):
+            with self.lock:
+                self.open_now -= 1
+
+
+def run_container(engine, invocations, stale, latencies, errors):
+    for n in range(invocations):
+        if stale and n and n % STALE_EVERY == 0:
+            time.sleep(2)
+        start = time.perf_counter()
+        try:
+            conn = engine.connect()
+            conn.exec_driver_sql('SELECT 1').scalar()
+            conn.close()
+        except SQLAlchemyError:
+            errors.append(n)
+            continue
+        latencies.append(time.perf_counter() - start)
+    # En el mismo hilo: SQLite no deja cerrar una conexión desde otro
+    engine.dispose()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float('nan')
+
+
+def main():
+    args = sys.argv[1:]
+    containers = int(args[args.index('--containers') + 1]) if '--containers' in args else 8
+    invocations = int(args[args.index('--invocations') + 1]) if '--invocations' in args else 200
+    stale = '--stale' in args
+    directory = tempfile.TemporaryDirectory()
+    url = os.environ.get('DB_URL') or f'sqlite:///{os.path.join(directory.name, "bench.db")}'
+    if stale and not url.startswith('mysql'):
+        print('--stale necesita DB_URL de MySQL')
+        return 1
+
+    print(f'{containers} contenedores x {invocations} invocaciones, {url.split("://")[0]}'
+          f'{", conexiones vencidas" if stale else ""}')
+    print(f'{"modo":<8} {"p50 ms":>8} {"p99 ms":>8} {"abiertas":>9} {"máx. a la vez":>14} {"errores":>8}')
+    for mode in MODES:
+        counter = Counter()
+        engines = [build_engine(mode, url) for _ in range(containers)]
+        for engine in engines:
+            counter.track(engine, stale)
+        latencies, errors = [], []
+        threads = [threading.Thread(target=run_container, args=(engine, invocations, stale, latencies, errors))
+                   for engine in engines]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f'{mode:<8} {percentile(latencies, 0.5) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f} '
+              f'{counter.opened:>9} {counter.peak:>14} {len(errors):>8}')
+    directory.cleanup()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
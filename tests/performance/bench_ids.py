@@ -0,0 +1,87 @@
+"""Inserción masiva con llaves uuid4 contra llaves ordenadas por tiempo (sispe_common.ids).
+
+Inserta las mismas filas (id, fk_user, fk_film, grade, con índice secundario por fk_film)
+en dos tablas, una con cada tipo de llave, y reporta filas por segundo y el tamaño final de
+datos e índices. Con DB_URL apuntando a MySQL se mide InnoDB (information_schema, después de
+ANALYZE TABLE); sin DB_URL se usa SQLite en archivo con tablas WITHOUT ROWID, que también
+guardan las filas en el árbol de la llave primaria.
+
+Uso: [DB_URL=mysql+pymysql://...] python -m tests.performance.bench_ids [filas]
+"""
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'common', 'python'))
+
+from sqlalchemy import MetaData, Table, Column, BINARY, DECIMAL, Index, create_engine, text  # noqa: E402
+from sispe_common.ids import new_id  # noqa: E402
+
+BATCH_SIZE = 10_000
+GENERATORS = (('uuid4', lambda: uuid.uuid4().bytes), ('time-ordered', new_id))
+
+
+def bench_table(metadata, name):
+    return Table(name, metadata,
+                 Column('id', BINARY(16), primary_key=True),
+                 Column('fk_user', BINARY(16), nullable=False),
+                 Column('fk_film', BINARY(16), nullable=False),
+                 Column('grade', DECIMAL(3, 1), nullable=False),
+                 Index(f'{name}_film_idx', 'fk_film'),
+                 sqlite_with_rowid=False)
+
+
+def insert_rows(engine, table, count, generate):
+    # Las mismas llaves foráneas para las dos tablas; solo cambia la llave primaria
+    users = [bytes([n % 256]) * 16 for n in range(997)]
+    films = [bytes([n % 256, n // 256]) * 8 for n in range(4999)]
+    start = time.perf_counter()
+    for offset in range(0, count, BATCH_SIZE):
+        rows = [{'id': generate(), 'fk_user': users[n % len(users)], 'fk_film': films[n % len(films)], 'grade': 5}
+                for n in range(offset, min(offset + BATCH_SIZE, count))]
+        with engine.begin() as conn:
+            conn.execute(table.insert(), rows)
+    return time.perf_counter() - start
+
+
+# (bytes de datos, bytes de índices secundarios); en SQLite se reporta el archivo completo
+def table_size(engine, table):
+    with engine.connect() as conn:
+        if engine.dialect.name == 'mysql':
+            conn.execute(text(f'ANALYZE TABLE {table.name}'))
+            row = conn.execute(text('SELECT data_length, index_length FROM information_schema.tables '
+                                    'WHERE table_schema = DATABASE() AND table_name = :name'),
+                               {'name': table.name}).first()
+            return row[0], row[1]
+        page_size = conn.execute(text('PRAGMA page_size')).scalar()
+        page_count = conn.execute(text('PRAGMA page_count')).scalar()
+        return page_size * page_count, None
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    db_url = os.environ.get('DB_URL')
+    directory = tempfile.TemporaryDirectory()
+
+    print(f'{count} filas, lotes de {BATCH_SIZE}, {db_url.split("://")[0] if db_url else "sqlite"}')
+    print(f'{"llave":<14} {"filas/s":>10} {"datos MiB":>10} {"índices MiB":>12}')
+    for name, generate in GENERATORS:
+        metadata = MetaData()
+        table = bench_table(metadata, f'bench_ids_{name.replace("-", "_")}')
+        engine = create_engine(db_url or f'sqlite:///{os.path.join(directory.name, table.name)}.db')
+        metadata.drop_all(engine)
+        metadata.create_all(engine)
+        elapsed = insert_rows(engine, table, count, generate)
+        data, index = table_size(engine, table)
+        index_mib = f'{index / 2**20:>12.1f}' if index is not None else f'{"-":>12}'
+        print(f'{name:<14} {count / elapsed:>10.0f} {data / 2**20:>10.1f} {index_mib}')
+        if db_url:
+            metadata.drop_all(engine)
+        engine.dispose()
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Compara la serialización de listas (antes) contra sispe_common.serializer (después).
+
+Uso: python -m tests.performance.bench_serializer [filas]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'common', 'python'))
+
+from sqlalchemy import MetaData, Table, Column, BINARY, DECIMAL, VARCHAR, create_engine  # noqa: E402
+from sispe_common.serializer import dump_rows  # noqa: E402
+
+metadata = MetaData()
+rateings = Table('rateings', metadata,
+                 Column('rateing_id', BINARY(16), primary_key=True),
+                 Column('grade', DECIMAL(2, 1), nullable=False),
+                 Column('comment', VARCHAR(255)),
+                 Column('fk_user', BINARY(16)),
+                 Column('fk_film', BINARY(16)))
+
+
+def seed(engine, count):
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(rateings.insert(), [
+            {'rateing_id': uuid.uuid4().bytes, 'grade': Decimal(n % 50) / 10, 'comment': f'Comentario {n}',
+             'fk_user': uuid.uuid4().bytes, 'fk_film': uuid.uuid4().bytes}
+            for n in range(count)
+        ])
+
+
+# Lo que hacían get_rateing/get_films: lista de dicts con isinstance por valor y json.dumps al final
+def before(conn):
+    query = rateings.select()
+    result = conn.execute(query)
+    rateing_list = [
+        {column: value.hex() if isinstance(value, bytes) else (float(value) if isinstance(value, Decimal) else value)
+         for column, value in row._mapping.items()}
+        for row in result
+    ]
+    return json.dumps(rateing_list)
+
+
+def after(conn):
+    query = rateings.select()
+    result = conn.execution_options(stream_results=True).execute(query)
+    return dump_rows(result, query.selected_columns)[0]
+
+
+def measure(engine, serialize):
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        body = serialize(conn)
+        elapsed = time.perf_counter() - start
+    with engine.connect() as conn:
+        tracemalloc.start()
+        serialize(conn)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return body, elapsed, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # Base en memoria compartida entre conexiones; keep_alive evita que se descarte
+    engine = create_engine('sqlite:///file:bench_serializer?mode=memory&cache=shared&uri=true')
+    keep_alive = engine.connect()
+    seed(engine, count)
+
+    before_body, before_time, before_peak = measure(engine, before)
+    after_body, after_time, after_peak = measure(engine, after)
+    assert json.loads(before_body) == json.loads(after_body)
+
+    print(f'{count} filas, {len(after_body) / 1024 / 1024:.1f} MiB de JSON')
+    print(f'{"":8}{"tiempo (s)":>12}{"pico (MiB)":>14}')
+    print(f'{"antes":8}{before_time:12.3f}{before_peak / 1024 / 1024:14.1f}')
+    print(f'{"despues":8}{after_time:12.3f}{after_peak / 1024 / 1024:14.1f}')
+    keep_alive.close()
+
+
+if __name__ == '__main__':
+    main()
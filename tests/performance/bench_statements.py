@@ -0,0 +1,68 @@
+"""Costo de armar las sentencias en cada invocación contra armarlas una vez por contenedor.
+
+Ejecuta la misma lectura por llave primaria (la ficha de get_film, con sus dos JOIN) de tres
+formas y reporta microsegundos por ejecución:
+  per-call:   la sentencia se arma en cada llamada con el valor incrustado como literal de
+              parámetro, como estaban los handlers
+  prebuilt:   la sentencia se arma una sola vez con bindparam (get_film.SELECT_FILM)
+  no-cache:   prebuilt, pero con compiled_cache=None para ver cuánto ahorra la caché de
+              compilación de SQLAlchemy
+La base es SQLite en memoria para que el tiempo medido sea sobre todo el de Python.
+
+Uso: python -m tests.performance.bench_statements [ejecuciones]
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, 'common', 'python'))
+sys.path.insert(0, ROOT)
+
+from sqlalchemy import select  # noqa: E402
+from sispe_common import tables  # noqa: E402
+from get_film.get_film import SELECT_FILM  # noqa: E402
+from tests.unit.db_utils import film_row, sqlite_engine  # noqa: E402
+
+FILM = bytes([1]) * 16
+CATEGORY = bytes([2]) * 16
+
+
+def per_call(conn):
+    query = select([tables.films, tables.categories.c.name.label('category_name'), tables.film_rating_stats])\
+        .select_from(tables.films
+                     .join(tables.categories, tables.films.c.fk_category == tables.categories.c.category_id)
+                     .outerjoin(tables.film_rating_stats, tables.film_rating_stats.c.fk_film == tables.films.c.film_id))\
+        .where(tables.films.c.film_id == FILM)
+    return conn.execute(query).fetchone()
+
+
+def prebuilt(conn):
+    return conn.execute(SELECT_FILM, {'film_id': FILM}).fetchone()
+
+
+def run(conn, fetch, count):
+    fetch(conn)
+    start = time.perf_counter()
+    for _ in range(count):
+        fetch(conn)
+    return (time.perf_counter() - start) / count * 1_000_000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    engine = sqlite_engine(tables.metadata)
+    with engine.begin() as conn:
+        conn.execute(tables.categories.insert(), {'category_id': CATEGORY, 'name': 'Drama'})
+        conn.execute(tables.films.insert(), film_row(FILM, fk_category=CATEGORY))
+
+    print(f'{count} ejecuciones')
+    print(f'{"modo":<10} {"us/ejecución":>13}')
+    with engine.connect() as conn:
+        print(f'{"per-call":<10} {run(conn, per_call, count):>13.1f}')
+        print(f'{"prebuilt":<10} {run(conn, prebuilt, count):>13.1f}')
+        print(f'{"no-cache":<10} {run(conn.execution_options(compiled_cache=None), prebuilt, count):>13.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Construcción, memoria y latencia del índice de prefijos de suggest_films.
+
+Uso: python -m tests.performance.bench_suggest [titulos]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'common', 'python'))
+
+from suggest_films.suggest_films import build_prefix_index, lookup, normalize  # noqa: E402
+
+WORDS = ['la', 'el', 'noche', 'amor', 'guerra', 'matrix', 'río', 'canción', 'última', 'ciudad', 'sombra',
+         'regreso', 'héroe', 'mar', 'tiempo', 'fuego', 'luna', 'camino', 'secreto', 'invierno', 'estrella']
+
+
+def random_titles(count):
+    rng = random.Random(7)
+    return [(uuid.UUID(int=rng.getrandbits(128)).bytes,
+             ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 5))).capitalize() + f' {n}')
+            for n in range(count)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = random_titles(count)
+
+    start = time.perf_counter()
+    build_prefix_index(rows)
+    build_time = time.perf_counter() - start
+
+    tracemalloc.start()
+    keys, titles, ids = build_prefix_index(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    index = {'keys': keys, 'titles': titles, 'ids': ids}
+
+    rng = random.Random(11)
+    prefixes = [normalize(title)[:rng.randint(1, 8)] for _, title in rng.sample(rows, 10_000)]
+    latencies = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        lookup(index, prefix, 10)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    print(f'{count} títulos')
+    print(f'construcción: {build_time * 1000:.0f} ms')
+    print(f'memoria del índice: {size / 1024 / 1024:.1f} MiB')
+    print(f'lookup p50: {latencies[len(latencies) // 2] * 1e6:.1f} us, '
+          f'p99: {latencies[int(len(latencies) * 0.99)] * 1e6:.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+from unittest.mock import patch
+import re
+from sqlalchemy import create_engine, event, select, func, literal_column, text, type_coerce, Table, Column, BINARY, \
+    Float
+from sqlalchemy.pool import StaticPool
+from sispe_common.tables import films
+
+# Tabla virtual FTS5 que hace las veces del índice FULLTEXT de films en SQLite
+FTS5_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS films_fts USING fts5(title, description, content='films', content_rowid='rowid')",
+    "CREATE TRIGGER IF NOT EXISTS films_fts_ai AFTER INSERT ON films BEGIN "
+    "INSERT INTO films_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS films_fts_ad AFTER DELETE ON films BEGIN "
+    "INSERT INTO films_fts(films_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS films_fts_au AFTER UPDATE ON films BEGIN "
+    "INSERT INTO films_fts(films_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO films_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    "INSERT INTO films_fts(films_fts) VALUES ('rebuild')",
+]
+
+
+# sispe_common.tables tiene llaves foráneas a tablas que no declara (roles). Para poder crear
+# el esquema se copia la tabla si otro metadata la declara, o se agrega una tabla mínima con
+# su llave primaria.
+def _declare_referenced_tables(metadatas):
+    declared = {}
+    for metadata in metadatas:
+        for name, table in metadata.tables.items():
+            declared.setdefault(name, table)
+    changed = True
+    while changed:
+        changed = False
+        for metadata in metadatas:
+            for table in list(metadata.tables.values()):
+                for foreign_key in table.foreign_keys:
+                    name, column = foreign_key.target_fullname.split('.')
+                    if name in metadata.tables:
+                        continue
+                    if name in declared:
+                        declared[name].to_metadata(metadata)
+                    else:
+                        Table(name, metadata, Column(column, BINARY(16), primary_key=True))
+                    changed = True
+
+
+def create_schema(engine, *metadatas):
+    _declare_referenced_tables(metadatas)
+    for metadata in metadatas:
+        metadata.create_all(engine)
+
+
+# Motor SQLite en memoria que comparte una sola conexión, para probar los handlers sin RDS
+def sqlite_engine(*metadatas):
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    create_schema(engine, *metadatas)
+    return engine
+
+
+# Fila completa de films; overrides reemplaza solo las columnas que le importan a la prueba
+def film_row(film_id, **overrides):
+    return {'film_id': film_id, 'title': 'Film', 'description': 'Desc', 'length': 1.5, 'status': 'Activo',
+            'fk_category': bytes(16), 'front_page': 'front.png', 'file': 'film.mp4', **overrides}
+
+
+# La misma fila como la recibe un handler en el body, con los ids en hexadecimal
+def hex_row(row):
+    return {key: (value.hex() if isinstance(value, bytes) else value) for key, value in row.items()}
+
+
+# Inicia los patchers y los detiene al terminar la prueba
+def start_patches(test_case, *patchers):
+    for patcher in patchers:
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
+
+
+# Apunta el db_connection de cada handler al motor de la prueba
+def patch_db_connection(test_case, engine, *modules):
+    start_patches(test_case, *(patch.object(module, 'db_connection', engine) for module in modules))
+
+
+# Lista que se llena con el SQL de cada sentencia que ejecuta el motor hasta que termina la
+# prueba. Con parameters=True guarda (sql, parámetros) y omite los executemany, para poder
+# volver a ejecutar cada sentencia
+def record_statements(test_case, engine, parameters=False):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, params, context, executemany):
+        if not parameters:
+            statements.append(statement)
+        elif not executemany:
+            statements.append((statement, params))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    test_case.addCleanup(event.remove, engine, 'before_cursor_execute', before_cursor_execute)
+    return statements
+
+
+def create_fts5_search_index(conn):
+    for statement in FTS5_DDL:
+        conn.execute(text(statement))
+
+
+# Sustituto de search_films.relevance_query sobre FTS5; los términos se citan para que no se
+# interpreten como operadores
+def fts5_relevance_query(q):
+    fts_query = ' OR '.join(f'"{term}"' for term in re.findall(r'\w+', q))
+    films_fts = literal_column('films_fts')
+    score = type_coerce(-func.bm25(films_fts), Float).label('score')
+    return select([films, score])\
+        .select_from(films.join(text('films_fts'), literal_column('films_fts.rowid') == literal_column('films.rowid')))\
+        .where(films_fts.op('MATCH')(fts_query))
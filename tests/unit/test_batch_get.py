@@ -0,0 +1,62 @@
+import unittest
+import json
+from batch_get import batch_get
+from batch_get.batch_get import lambda_handler
+from tests.unit.db_utils import film_row, patch_db_connection, record_statements, sqlite_engine
+from sispe_common import tables
+
+CATEGORY = bytes.fromhex('0a' * 16)
+USER = bytes([1]) * 16
+FILMS = [bytes([2 + n]) * 16 for n in range(3)]
+MISSING = bytes([9]) * 16
+
+
+class BatchGetTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        with self.engine.begin() as conn:
+            conn.execute(tables.categories.insert().values(category_id=CATEGORY, name='Drama'))
+            conn.execute(tables.films.insert(), [
+                film_row(film_id, title=f'Film {n}', fk_category=CATEGORY) for n, film_id in enumerate(FILMS)])
+            conn.execute(tables.users.insert().values(
+                user_id=USER, name='Ana', lastname='Ruiz', email='ana@example.com', password='secreto',
+                fk_rol=bytes(16), fk_subscription=bytes(16)))
+        patch_db_connection(self, self.engine, batch_get)
+        self.statements = record_statements(self, self.engine)
+
+    def fetch(self, entity, ids):
+        self.statements.clear()
+        result = lambda_handler({'pathParameters': {'entity': entity}, 'body': json.dumps({'ids': ids})}, None)
+        return result['statusCode'], json.loads(result['body'])
+
+    def test_results_follow_request_order_in_one_query(self):
+        ids = [FILMS[2].hex(), MISSING.hex(), FILMS[0].hex(), FILMS[2].hex()]
+        status_code, body = self.fetch('films', ids)
+        self.assertEqual(status_code, 200)
+        self.assertEqual([film and film['film_id'] for film in body['results']],
+                         [FILMS[2].hex(), None, FILMS[0].hex(), FILMS[2].hex()])
+        self.assertEqual(body['results'][0]['title'], 'Film 2')
+        self.assertEqual(body['missing'], [MISSING.hex()])
+        self.assertEqual(len(self.statements), 1)
+
+    def test_users_never_include_password(self):
+        status_code, body = self.fetch('users', [USER.hex()])
+        self.assertEqual(status_code, 200)
+        self.assertEqual(body['results'][0]['email'], 'ana@example.com')
+        self.assertNotIn('password', body['results'][0])
+
+    def test_categories(self):
+        _, body = self.fetch('categories', [CATEGORY.hex()])
+        self.assertEqual(body['results'], [{'category_id': CATEGORY.hex(), 'name': 'Drama'}])
+
+    def test_rejects_bad_requests(self):
+        self.assertEqual(self.fetch('roles', [USER.hex()])[0], 404)
+        self.assertEqual(self.fetch('films', [])[0], 400)
+        self.assertEqual(self.fetch('films', ['xyz']), (400, 'Invalid id at position 0'))
+        self.assertEqual(self.fetch('films', [MISSING.hex()] * 501)[0], 400)
+        self.assertEqual(self.statements, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
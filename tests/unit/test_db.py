@@ -0,0 +1,85 @@
+from unittest.mock import patch
+import unittest
+import os
+import json
+import tempfile
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sispe_common import tables
+from sispe_common.db import create_db_engine
+from create_rateing import create_rateing
+from get_films import get_films
+from update_rateing import update_rateing
+from tests.unit.db_utils import create_schema, patch_db_connection
+
+
+class CreateDbEngineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.url = f'sqlite:///{os.path.join(directory.name, "sispe.db")}'
+
+    def invoke(self, engine, times):
+        with self.assertLogs(level='INFO') as logs:
+            for _ in range(times):
+                conn = engine.connect()
+                conn.exec_driver_sql('SELECT 1')
+                conn.close()
+        return [message.split(':', 2)[-1].split(' in ')[0] for message in logs.output]
+
+    def test_pool_mode_keeps_one_connection_per_container(self):
+        engine = create_db_engine(self.url)
+        self.assertEqual(self.invoke(engine, 3),
+                         ['DB connection opened', 'DB connection reused', 'DB connection reused'])
+        self.assertEqual(engine.pool.size(), 1)
+        self.assertEqual(engine.pool.checkedin(), 1)
+
+    def test_stale_connection_is_replaced(self):
+        engine = create_db_engine(self.url)
+        conn = engine.connect()
+        dbapi_connection = conn.connection.connection
+        conn.close()
+        # El servidor cerró la conexión mientras el contenedor estaba congelado: el ping lo
+        # detecta y la invocación recibe una conexión nueva en vez de un error
+        dbapi_connection.close()
+        self.assertEqual(self.invoke(engine, 2), ['DB connection opened', 'DB connection reused'])
+
+    def test_proxy_mode_does_not_pool(self):
+        with patch.dict(os.environ, {'DB_POOL_MODE': 'proxy'}):
+            engine = create_db_engine(self.url)
+        self.assertEqual(self.invoke(engine, 2), ['DB connection opened', 'DB connection opened'])
+
+    def test_error_paths_return_the_connection(self):
+        with patch.dict(os.environ, {'DB_POOL_TIMEOUT': '1'}):
+            engine = create_db_engine(self.url)
+        create_schema(engine, tables.metadata)
+        patch_db_connection(self, engine, create_rateing, get_films, update_rateing)
+
+        def rate(module, user, **event):
+            body = {'grade': 7.0, 'fk_user': (bytes([user]) * 16).hex(), 'fk_film': (bytes([9]) * 16).hex()}
+            return module.lambda_handler({'body': json.dumps(body), **event}, None)['statusCode']
+
+        self.assertEqual(rate(create_rateing, 1), 200)
+        self.assertEqual(rate(create_rateing, 2), 200)
+        with engine.connect() as conn:
+            rateing_id = conn.execute(select([tables.rateings.c.rateing_id])
+                                      .where(tables.rateings.c.fk_user == bytes([2]) * 16)).scalar()
+        # Mover la calificación del usuario 2 al usuario 1 choca con la llave única (409)
+        self.assertEqual(rate(update_rateing, 1, pathParameters={'id': rateing_id.hex()}), 409)
+        self.assertEqual(engine.pool.checkedout(), 0)
+        self.assertEqual(rate(create_rateing, 3), 200)
+
+        with patch.object(get_films, 'fetch_page', side_effect=OperationalError('SELECT', {}, Exception())):
+            self.assertEqual(get_films.lambda_handler({'queryStringParameters': None}, None)['statusCode'], 500)
+        self.assertEqual(engine.pool.checkedout(), 0)
+        self.assertEqual(get_films.lambda_handler({'queryStringParameters': None}, None)['statusCode'], 404)
+
+    def test_invalid_mode(self):
+        with patch.dict(os.environ, {'DB_POOL_MODE': 'bouncer'}):
+            with self.assertRaises(ValueError):
+                create_db_engine(self.url)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+from unittest.mock import patch
+import unittest
+import json
+from sqlalchemy import event, select, func
+from sispe_common import tables
+from delete_film import delete_film
+from delete_film.delete_film import lambda_handler
+from tests.unit.db_utils import film_row, patch_db_connection, sqlite_engine, start_patches
+
+CATEGORY = bytes.fromhex('0a' * 16)
+FILM = bytes([1]) * 16
+OTHER_FILM = bytes([2]) * 16
+
+
+class DeleteFilmTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        with self.engine.begin() as conn:
+            conn.execute(tables.categories.insert().values(category_id=CATEGORY, name='A'))
+            conn.execute(tables.films.insert(), [film_row(FILM, fk_category=CATEGORY),
+                                                film_row(OTHER_FILM, fk_category=CATEGORY)])
+            conn.execute(tables.favorites.insert(), [
+                {'favorite_id': bytes([10 + n]) * 16, 'fk_user': bytes([n]) * 16, 'fk_film': FILM} for n in range(5)
+            ] + [{'favorite_id': bytes([99]) * 16, 'fk_user': bytes([1]) * 16, 'fk_film': OTHER_FILM}])
+            conn.execute(tables.rateings.insert(), [
+                {'rateing_id': bytes([20 + n]) * 16, 'grade': 4, 'fk_user': bytes([n]) * 16, 'fk_film': FILM} for n in range(3)
+            ])
+        patch_db_connection(self, self.engine, delete_film)
+        start_patches(self, patch.object(delete_film, 'DELETE_CHUNK_SIZE', 2))
+
+    def count(self, table):
+        with self.engine.connect() as conn:
+            return conn.execute(select([func.count()]).select_from(table)).scalar()
+
+    def test_deletes_dependents(self):
+        result = lambda_handler({'pathParameters': {'film_id': FILM.hex()}}, None)
+        self.assertEqual(result['statusCode'], 200)
+        self.assertEqual(json.loads(result['body'])['deleted'], {'films': 1, 'favorites': 5, 'rateings': 3})
+        self.assertEqual(self.count(tables.films), 1)
+        self.assertEqual(self.count(tables.favorites), 1)
+        self.assertEqual(self.count(tables.rateings), 0)
+
+    def test_counts_only_rows_actually_deleted(self):
+        # Otra invocación borra la película entre la lectura y la transacción de esta
+        def delete_concurrently(conn, cursor, statement, *args):
+            if statement.startswith('SELECT favorites'):
+                cursor.connection.execute('DELETE FROM films WHERE film_id = ?', (FILM,))
+
+        event.listen(self.engine, 'before_cursor_execute', delete_concurrently)
+        result = lambda_handler({'pathParameters': {'film_id': FILM.hex()}}, None)
+        self.assertEqual(result['statusCode'], 200)
+        self.assertEqual(json.loads(result['body'])['deleted'], {'films': 0, 'favorites': 5, 'rateings': 3})
+
+    def test_film_not_found(self):
+        result = lambda_handler({'pathParameters': {'film_id': ('ff' * 16)}}, None)
+        self.assertEqual(result['statusCode'], 404)
+        self.assertEqual(self.count(tables.favorites), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
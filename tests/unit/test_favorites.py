@@ -0,0 +1,126 @@
+import unittest
+import json
+from sqlalchemy import select, func
+from create_favorite import create_favorite
+from delete_favorite import delete_favorite
+from delete_user import delete_user
+from sync_favorites import sync_favorites
+from tests.unit.db_utils import film_row, patch_db_connection, record_statements, sqlite_engine
+from sispe_common import tables
+
+USER = bytes([1]) * 16
+FILM = bytes([2]) * 16
+INACTIVE_FILM = bytes([3]) * 16
+MISSING = bytes([9]) * 16
+
+
+class FavoritesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        with self.engine.begin() as conn:
+            conn.execute(tables.users.insert().values(
+                user_id=USER, name='Ana', lastname='Ruiz', email='ana@example.com', password='x',
+                fk_rol=bytes(16), fk_subscription=bytes(16)))
+            conn.execute(tables.films.insert(), [film_row(FILM), film_row(INACTIVE_FILM, status='Inactivo')])
+        self.statements = record_statements(self, self.engine)
+        patch_db_connection(self, self.engine, create_favorite, delete_favorite, sync_favorites, delete_user)
+
+    def call(self, module, user, film):
+        self.statements.clear()
+        body = json.dumps({'fk_user': user.hex(), 'fk_film': film.hex()})
+        result = module.lambda_handler({'body': body}, None)
+        return result['statusCode'], json.loads(result['body'])
+
+    def favorite_count(self):
+        with self.engine.connect() as conn:
+            return conn.execute(select([func.count()]).select_from(tables.favorites)).scalar()
+
+    def film_counter(self, film_id):
+        with self.engine.connect() as conn:
+            return conn.execute(select([tables.films.c.favorite_count])
+                                .where(tables.films.c.film_id == film_id)).scalar()
+
+    def test_add_statement_count(self):
+        # El INSERT ... SELECT y el UPDATE del contador de la película
+        self.assertEqual(self.call(create_favorite, USER, FILM),
+                         (200, 'Película agregada a la lista de favoritos'))
+        self.assertEqual(len(self.statements), 2)
+        self.assertEqual(self.call(create_favorite, USER, FILM),
+                         (400, 'Película ya agregada a la lista de favoritos'))
+        self.assertEqual(len(self.statements), 1)
+        self.assertEqual(self.favorite_count(), 1)
+        self.assertEqual(self.film_counter(FILM), 1)
+
+    def test_add_failures_keep_their_messages(self):
+        self.assertEqual(self.call(create_favorite, MISSING, FILM), (400, 'Usuario no encontrado'))
+        self.assertEqual(self.call(create_favorite, USER, INACTIVE_FILM),
+                         (400, 'Película no encontrada o no está activa'))
+        self.assertEqual(self.call(create_favorite, USER, MISSING),
+                         (400, 'Película no encontrada o no está activa'))
+        self.assertEqual(len(self.statements), 2)
+        self.assertEqual(self.favorite_count(), 0)
+        self.assertEqual(self.film_counter(INACTIVE_FILM), 0)
+
+    def test_delete_statement_count(self):
+        self.call(create_favorite, USER, FILM)
+        self.assertEqual(self.call(delete_favorite, USER, FILM),
+                         (200, 'Se ha eliminado la pelicula de la lista de favoritos'))
+        self.assertEqual(len(self.statements), 2)
+        self.assertEqual(self.film_counter(FILM), 0)
+        self.assertEqual(self.call(delete_favorite, USER, FILM),
+                         (400, 'Pelicula no esta en la lista de favoritos'))
+        self.assertEqual(self.call(delete_favorite, MISSING, FILM), (400, 'Usuario no encontrado'))
+        self.assertEqual(len(self.statements), 2)
+        self.assertEqual(self.favorite_count(), 0)
+
+    def sync(self, user, add=(), remove=()):
+        self.statements.clear()
+        body = json.dumps({'fk_user': user.hex(), 'add': list(add), 'remove': list(remove)})
+        result = sync_favorites.lambda_handler({'body': body}, None)
+        return result['statusCode'], json.loads(result['body'])
+
+    def test_sync_applies_batch_with_per_film_results(self):
+        self.call(create_favorite, USER, FILM)
+        status, body = self.sync(USER, add=[INACTIVE_FILM.hex(), MISSING.hex(), 'xyz'], remove=[FILM.hex()])
+        self.assertEqual(status, 200)
+        self.assertEqual([(r['action'], r['status']) for r in body['results']], [
+            ('add', 'film_inactive'), ('add', 'film_not_found'), ('add', 'invalid_id'), ('remove', 'removed')])
+        self.assertEqual(self.favorite_count(), 0)
+
+        status, body = self.sync(USER, add=[FILM.hex(), FILM.hex()], remove=[MISSING.hex()])
+        self.assertEqual([r['status'] for r in body['results']], ['added', 'added', 'not_favorite'])
+        # Usuario, películas, favoritos actuales, INSERT y contador; no hay nada que borrar
+        self.assertEqual(len(self.statements), 5)
+        self.assertEqual(self.favorite_count(), 1)
+        self.assertEqual(self.film_counter(FILM), 1)
+
+    def test_sync_statement_count_does_not_grow_with_batch(self):
+        with self.engine.begin() as conn:
+            conn.execute(tables.films.insert(), [film_row(bytes([100 + n]) * 16) for n in range(50)])
+        status, body = self.sync(USER, add=[(bytes([100 + n]) * 16).hex() for n in range(50)])
+        self.assertEqual(status, 200)
+        self.assertEqual(self.favorite_count(), 50)
+        status, body = self.sync(USER, remove=[(bytes([100 + n]) * 16).hex() for n in range(0, 50, 2)])
+        self.assertEqual(len(self.statements), 4)
+        self.assertEqual(self.favorite_count(), 25)
+        self.assertEqual([self.film_counter(bytes([100 + n]) * 16) for n in range(2)], [0, 1])
+
+    def test_deleting_user_releases_counters(self):
+        self.sync(USER, add=[FILM.hex()])
+        result = delete_user.lambda_handler({'pathParameters': {'user_id': USER.hex()}}, None)
+        self.assertEqual(result['statusCode'], 200)
+        self.assertEqual(self.favorite_count(), 0)
+        self.assertEqual(self.film_counter(FILM), 0)
+
+    def test_sync_rejects_bad_requests(self):
+        self.assertEqual(self.sync(MISSING, add=[FILM.hex()]), (400, 'Usuario no encontrado'))
+        self.assertEqual(self.sync(USER, add=[FILM.hex()], remove=[FILM.hex().upper()])[0], 400)
+        self.assertEqual(self.sync(USER, add=[FILM.hex()] * 501)[0], 400)
+        for body in ('[]', '"x"', '3', 'null'):
+            result = sync_favorites.lambda_handler({'body': body}, None)
+            self.assertEqual(result['statusCode'], 400, body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,68 +1,85 @@
-from unittest.mock import patch, MagicMock
 import unittest
-from botocore.exceptions import ClientError
 import json
+from get_favorites import get_favorites
 from get_favorites.get_favorites import lambda_handler
+from tests.unit.db_utils import film_row, patch_db_connection, record_statements, sqlite_engine
+from sispe_common import tables
+
+USER = bytes.fromhex('1234567890abcdef1234567890abcdef')
+LIGHT_USER = bytes([2]) * 16
+CATEGORY = bytes([3]) * 16
 
 mock_event = {
     "pathParameters": {
-        "fk_user": "qwertyuiop1234567890abcdef1234567890"
+        "fk_user": USER.hex()
     }
 }
 
-class MyTestCase(unittest.TestCase):
 
-    @patch.dict("os.environ", {"DB_USER": "user", "DB_PASSWORD": "password", "DB_NAME": "database", "DB_HOST": "host"})
-    @patch("get_favorites.db_connection.connect")
-    def test_lambda_handler(self, mock_connect):
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
+class MyTestCase(unittest.TestCase):
 
-        # Mock the SQL execution and results
-        mock_conn.execute.return_value.fetchall.return_value = [
-            {
-                "fk_film": bytes.fromhex("1234567890abcdef1234567890abcdef"),
-                "title": "Film Title",
-                "description": "Film Description",
-                "length": 120,
-                "category_name": "Category"
-            }
-        ]
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        with self.engine.begin() as conn:
+            conn.execute(tables.categories.insert().values(category_id=CATEGORY, name='Category'))
+            conn.execute(tables.users.insert(), [
+                {'user_id': user_id, 'name': 'Ana', 'lastname': 'Ruiz', 'email': f'{user_id.hex()}@example.com',
+                 'password': 'x', 'fk_rol': bytes([4]) * 16, 'fk_subscription': bytes([5]) * 16}
+                for user_id in (USER, LIGHT_USER)])
+            conn.execute(tables.films.insert(), [
+                film_row(bytes([10 + n]) * 16, title=f'Film {n}', fk_category=CATEGORY) for n in range(5)])
+            conn.execute(tables.favorites.insert(), [
+                {'favorite_id': bytes([50 + n]) * 16, 'fk_user': USER, 'fk_film': bytes([10 + n]) * 16}
+                for n in range(5)])
+        self.statements = record_statements(self, self.engine)
+        patch_db_connection(self, self.engine, get_favorites)
 
+    def test_lambda_handler(self):
         result = lambda_handler(mock_event, None)
         self.assertEqual(result["statusCode"], 200)
         body = json.loads(result["body"])
-        self.assertTrue(isinstance(body, list))
-        self.assertEqual(body[0]["title"], "Film Title")
+        self.assertEqual(body["favorites"][0]["title"], "Film 0")
+        self.assertEqual(body["favorites"][0]["category_name"], "Category")
+        self.assertEqual(len(body["favorites"]), 5)
+        self.assertIsNone(body["next_cursor"])
+        self.assertEqual(len(self.statements), 1)
 
-        mock_conn.close.assert_called_once()
+    def test_pages_follow_cursor(self):
+        titles = []
+        params = {'limit': '2'}
+        while True:
+            result = lambda_handler(dict(mock_event, queryStringParameters=params), None)
+            body = json.loads(result["body"])
+            titles += [favorite['title'] for favorite in body['favorites']]
+            if body['next_cursor'] is None:
+                break
+            params = {'limit': '2', 'cursor': body['next_cursor']}
+        self.assertEqual(titles, [f'Film {n}' for n in range(5)])
 
-    @patch.dict("os.environ", {"DB_USER": "user", "DB_PASSWORD": "password", "DB_NAME": "database", "DB_HOST": "host"})
-    @patch("get_favorites.db_connection.connect")
-    def test_lambda_handler_no_favorites(self, mock_connect):
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
+    def test_fields_restrict_columns(self):
+        params = {'fields': 'title', 'limit': '2'}
+        body = json.loads(lambda_handler(dict(mock_event, queryStringParameters=params), None)["body"])
+        self.assertEqual(body["favorites"][0], {'fk_film': (bytes([10]) * 16).hex(), 'title': 'Film 0'})
+        self.assertNotIn('description', self.statements[-1])
+        params = {'fields': 'length,secret'}
+        self.assertEqual(lambda_handler(dict(mock_event, queryStringParameters=params), None)["statusCode"], 400)
 
-        # Mock the SQL execution and results
-        mock_conn.execute.return_value.fetchall.return_value = []
-
-        result = lambda_handler(mock_event, None)
-        mock_conn.close.assert_called_once()
+    def test_lambda_handler_no_favorites(self):
+        result = lambda_handler({"pathParameters": {"fk_user": LIGHT_USER.hex()}}, None)
         self.assertEqual(result["statusCode"], 200)
         self.assertEqual(json.loads(result["body"]), 'Favoritos no encontrados')
 
-    @patch.dict("os.environ", {"DB_USER": "user", "DB_PASSWORD": "password", "DB_NAME": "database", "DB_HOST": "host"})
-    @patch("get_favorites.db_connection.connect")
-    def test_lambda_handler_user_not_found(self, mock_connect):
-        mock_conn = MagicMock()
-        mock_connect.return_value = mock_conn
-
-        # Mock the SQL execution and results
-        mock_conn.execute.side_effect = [None, []]
-
-        result = lambda_handler(mock_event, None)
+    def test_lambda_handler_user_not_found(self):
+        result = lambda_handler({"pathParameters": {"fk_user": "ab" * 16}}, None)
         self.assertEqual(result["statusCode"], 400)
         self.assertEqual(json.loads(result["body"]), 'Usuario no encontrado')
+        self.assertEqual(len(self.statements), 1)
+
+    def test_invalid_params(self):
+        self.assertEqual(lambda_handler({"pathParameters": {"fk_user": "qwerty"}}, None)["statusCode"], 400)
+        result = lambda_handler(dict(mock_event, queryStringParameters={'limit': '1000'}), None)
+        self.assertEqual(result["statusCode"], 400)
+
 
 if __name__ == '__main__':
     unittest.main()
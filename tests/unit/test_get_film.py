@@ -0,0 +1,72 @@
+from unittest.mock import patch
+import unittest
+import json
+import tempfile
+from sispe_common import tables
+from sispe_common.catalog import CatalogCache
+from create_rateing import create_rateing
+from get_film import get_film
+from get_film.get_film import lambda_handler
+from update_film import update_film
+from tests.unit.db_utils import film_row, hex_row, patch_db_connection, record_statements, sqlite_engine, \
+    start_patches
+
+CATEGORY = bytes.fromhex('0a' * 16)
+FILM = bytes([1]) * 16
+
+
+class GetFilmTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        with self.engine.begin() as conn:
+            conn.execute(tables.categories.insert().values(category_id=CATEGORY, name='Drama'))
+            conn.execute(tables.films.insert().values(film_row(FILM, fk_category=CATEGORY, favorite_count=4)))
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patch_db_connection(self, self.engine, get_film, create_rateing, update_film)
+        start_patches(self, patch.object(get_film, 'film_cache', CatalogCache('film_detail', directory=cache_dir.name)))
+        self.statements = record_statements(self, self.engine)
+
+    def fetch(self, film_id=FILM):
+        self.statements.clear()
+        result = lambda_handler({'pathParameters': {'film_id': film_id.hex()}}, None)
+        return result['statusCode'], json.loads(result['body'])
+
+    def test_detail_in_one_query(self):
+        body = {'grade': 8.0, 'fk_user': (bytes([2]) * 16).hex(), 'fk_film': FILM.hex()}
+        create_rateing.lambda_handler({'body': json.dumps(body)}, None)
+        status_code, film = self.fetch()
+        self.assertEqual(status_code, 200)
+        self.assertEqual(film['category_name'], 'Drama')
+        self.assertEqual(film['favorite_count'], 4)
+        self.assertEqual(film['rating_stats']['rating_count'], 1)
+        self.assertEqual(film['rating_stats']['average'], 8.0)
+        # Versión del catálogo y la consulta de la ficha
+        self.assertEqual(len(self.statements), 2)
+
+    def test_cached_until_film_is_updated(self):
+        _, film = self.fetch()
+        self.assertEqual(film['rating_stats']['rating_count'], 0)
+        _, film = self.fetch()
+        self.assertEqual(len(self.statements), 1)
+
+        update_film.lambda_handler({'body': json.dumps(hex_row(film_row(FILM, title='Nuevo', fk_category=CATEGORY)))}, None)
+        _, film = self.fetch()
+        self.assertEqual(film['title'], 'Nuevo')
+        self.assertEqual(len(self.statements), 2)
+
+    def test_ttl_expires_entries(self):
+        cache = CatalogCache('film_detail', directory=tempfile.mkdtemp(), ttl=30)
+        cache.put(1, 'key', 'body')
+        self.assertEqual(cache.get(1, 'key'), 'body')
+        with patch('sispe_common.catalog.time.time', return_value=cache.entries['key'][1] + 31):
+            self.assertIsNone(cache.get(1, 'key'))
+
+    def test_not_found_and_invalid(self):
+        self.assertEqual(self.fetch(bytes([9]) * 16)[0], 404)
+        self.assertEqual(lambda_handler({'pathParameters': {'film_id': 'xyz'}}, None)['statusCode'], 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+from unittest.mock import patch
+import unittest
+import json
+import tempfile
+from sispe_common import tables
+from sispe_common.catalog import CatalogCache
+from create_film import create_film
+from get_films import get_films
+from get_films.get_films import lambda_handler
+from tests.unit.db_utils import film_row, patch_db_connection, record_statements, sqlite_engine, start_patches
+
+CATEGORY_A = bytes.fromhex('0a' * 16)
+CATEGORY_B = bytes.fromhex('0b' * 16)
+
+
+class GetFilmsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        with self.engine.begin() as conn:
+            conn.execute(tables.categories.insert(), [
+                {'category_id': CATEGORY_A, 'name': 'A'},
+                {'category_id': CATEGORY_B, 'name': 'B'}
+            ])
+            conn.execute(tables.films.insert(), [
+                film_row(bytes([n]) * 16, title=f'Film {n}', fk_category=category, status=status)
+                for n, category, status in [(1, CATEGORY_A, 'Activo'), (2, CATEGORY_B, 'Activo'),
+                                            (3, CATEGORY_A, 'Inactivo'), (4, CATEGORY_A, 'Activo'),
+                                            (5, CATEGORY_B, 'Activo')]
+            ])
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patch_db_connection(self, self.engine, get_films, create_film)
+        start_patches(self, patch.object(get_films, 'film_cache', CatalogCache('films', directory=cache_dir.name)))
+
+    def fetch(self, **params):
+        result = lambda_handler({'queryStringParameters': params or None}, None)
+        return result['statusCode'], json.loads(result['body'])
+
+    def test_pages_follow_cursor(self):
+        titles = []
+        params = {'limit': '2'}
+        while True:
+            status_code, body = self.fetch(**params)
+            self.assertEqual(status_code, 200)
+            self.assertLessEqual(len(body['films']), 2)
+            titles.extend(film['title'] for film in body['films'])
+            if body['next_cursor'] is None:
+                break
+            params['cursor'] = body['next_cursor']
+        self.assertEqual(titles, ['Film 1', 'Film 2', 'Film 3', 'Film 4', 'Film 5'])
+
+    def test_last_page_has_no_cursor(self):
+        status_code, body = self.fetch(limit='5')
+        self.assertEqual(status_code, 200)
+        self.assertEqual(len(body['films']), 5)
+        self.assertIsNone(body['next_cursor'])
+
+    def test_filters(self):
+        status_code, body = self.fetch(status='Activo', fk_category=CATEGORY_A.hex())
+        self.assertEqual(status_code, 200)
+        self.assertEqual([film['title'] for film in body['films']], ['Film 1', 'Film 4'])
+        self.assertEqual(body['films'][0]['fk_category'], CATEGORY_A.hex())
+
+    def test_popular_sort_follows_counter(self):
+        with self.engine.begin() as conn:
+            for film, count in ((2, 7), (4, 3), (5, 7)):
+                conn.execute(tables.films.update().where(tables.films.c.film_id == bytes([film]) * 16)
+                             .values(favorite_count=count))
+        titles = []
+        params = {'sort': 'popular', 'status': 'Activo', 'limit': '2'}
+        while True:
+            status_code, body = self.fetch(**params)
+            self.assertEqual(status_code, 200)
+            titles.extend((film['title'], film['favorite_count']) for film in body['films'])
+            if body['next_cursor'] is None:
+                break
+            params['cursor'] = body['next_cursor']
+        self.assertEqual(titles, [('Film 5', 7), ('Film 2', 7), ('Film 4', 3), ('Film 1', 0)])
+
+        # El orden por id se sirve de la caché y no incluye el contador
+        _, body = self.fetch()
+        self.assertNotIn('favorite_count', body['films'][0])
+
+    def test_user_state_flags(self):
+        user, other_user = bytes([7]) * 16, bytes([8]) * 16
+        with self.engine.begin() as conn:
+            conn.execute(tables.favorites.insert(), [
+                {'favorite_id': bytes([70]) * 16, 'fk_user': user, 'fk_film': bytes([2]) * 16},
+                {'favorite_id': bytes([71]) * 16, 'fk_user': other_user, 'fk_film': bytes([1]) * 16}])
+            conn.execute(tables.rateings.insert(), [
+                {'rateing_id': bytes([80]) * 16, 'grade': 8.5, 'fk_user': user, 'fk_film': bytes([2]) * 16},
+                {'rateing_id': bytes([81]) * 16, 'grade': 3.0, 'fk_user': user, 'fk_film': bytes([4]) * 16},
+                {'rateing_id': bytes([82]) * 16, 'grade': 9.0, 'fk_user': other_user, 'fk_film': bytes([1]) * 16}])
+        status_code, body = self.fetch(user_id=user.hex(), limit='4')
+        self.assertEqual(status_code, 200)
+        self.assertEqual([(film['title'], film['is_favorite'], film['my_grade']) for film in body['films']], [
+            ('Film 1', False, None), ('Film 2', True, 8.5), ('Film 3', False, None), ('Film 4', False, 3.0)])
+        self.assertIsNotNone(body['next_cursor'])
+
+        _, body = self.fetch(user_id=user.hex(), sort='popular', status='Activo', fk_category=CATEGORY_B.hex())
+        self.assertEqual([film['is_favorite'] for film in body['films']], [False, True])
+
+        # Sin user_id la página no lleva el estado del usuario
+        _, body = self.fetch(limit='4')
+        self.assertNotIn('is_favorite', body['films'][0])
+
+    def test_fields_restrict_columns(self):
+        statements = record_statements(self, self.engine)
+        status_code, body = self.fetch(fields='title,status', limit='2')
+        self.assertEqual(status_code, 200)
+        # film_id es la llave del cursor y siempre se regresa
+        self.assertEqual(body['films'][0], {'film_id': (bytes([1]) * 16).hex(), 'title': 'Film 1', 'status': 'Activo'})
+        self.assertNotIn('front_page', statements[-1])
+        _, next_page = self.fetch(fields='title,status', limit='2', cursor=body['next_cursor'])
+        self.assertEqual([film['title'] for film in next_page['films']], ['Film 3', 'Film 4'])
+
+        # Cada selección de columnas es una entrada distinta en la caché
+        _, body = self.fetch(limit='2')
+        self.assertIn('file', body['films'][0])
+
+        _, body = self.fetch(fields='title', sort='popular')
+        self.assertEqual(set(body['films'][0]), {'film_id', 'title', 'favorite_count'})
+
+    def test_no_films_found(self):
+        status_code, body = self.fetch(cursor=(bytes([5]) * 16).hex())
+        self.assertEqual(status_code, 404)
+        self.assertEqual(body, 'No films found')
+
+    def test_warm_request_only_reads_version(self):
+        statements = record_statements(self, self.engine)
+        _, first = self.fetch(limit='2')
+        statements.clear()
+        _, second = self.fetch(limit='2')
+        self.assertEqual(first, second)
+        self.assertEqual(len(statements), 1)
+        self.assertIn('catalog_versions', statements[0])
+
+    def test_film_write_invalidates_snapshot(self):
+        _, before = self.fetch(limit='10')
+        result = create_film.lambda_handler({'body': json.dumps({
+            'title': 'Nueva', 'description': 'Nueva', 'length': 1.0, 'status': 'Activo',
+            'fk_category': CATEGORY_A.hex(), 'front_page': 'nueva.png', 'file': 'nueva.mp4'
+        })}, None)
+        self.assertEqual(result['statusCode'], 200)
+        _, after = self.fetch(limit='10')
+        self.assertEqual(len(after['films']), len(before['films']) + 1)
+
+    def test_if_none_match_returns_not_modified(self):
+        first = lambda_handler({'queryStringParameters': {'limit': '2'}}, None)
+        etag = first['headers']['ETag']
+        second = lambda_handler({'queryStringParameters': {'limit': '2'}, 'headers': {'if-none-match': etag}}, None)
+        self.assertEqual(second['statusCode'], 304)
+        self.assertEqual(second['body'], '')
+        self.assertEqual(second['headers']['ETag'], etag)
+
+    def test_invalid_params(self):
+        for params in ({'limit': '0'}, {'limit': 'abc'}, {'cursor': 'xyz'}, {'status': 'Borrado'},
+                       {'sort': 'title'}, {'user_id': 'abc'}, {'fields': 'title,favorite_count'}, {'fields': ','}, {'sort': 'popular', 'cursor': (bytes([1]) * 16).hex()}):
+            status_code, _ = self.fetch(**params)
+            self.assertEqual(status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import json
+from sispe_common import tables
+from get_rateing import get_rateing
+from get_rateing.get_rateing import lambda_handler
+from tests.unit.db_utils import patch_db_connection, sqlite_engine
+
+FILM_A = bytes.fromhex('0a' * 16)
+FILM_B = bytes.fromhex('0b' * 16)
+USER_A = bytes.fromhex('1a' * 16)
+USER_B = bytes.fromhex('1b' * 16)
+USER_C = bytes.fromhex('1c' * 16)
+
+
+def rateing_row(n, fk_film, fk_user):
+    return {
+        'rateing_id': bytes([n]) * 16,
+        'grade': 4.5,
+        'comment': f'Comment {n}',
+        'fk_user': fk_user,
+        'fk_film': fk_film
+    }
+
+
+class GetRateingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        with self.engine.begin() as conn:
+            conn.execute(tables.rateings.insert(), [
+                rateing_row(1, FILM_A, USER_A),
+                rateing_row(2, FILM_B, USER_A),
+                rateing_row(3, FILM_A, USER_B),
+                rateing_row(4, FILM_A, USER_C),
+                rateing_row(5, FILM_B, USER_B)
+            ])
+        patch_db_connection(self, self.engine, get_rateing)
+
+    def fetch(self, **params):
+        result = lambda_handler({'queryStringParameters': params or None}, None)
+        return result['statusCode'], json.loads(result['body'])
+
+    def test_film_pages_newest_first(self):
+        comments = []
+        params = {'fk_film': FILM_A.hex(), 'limit': '2'}
+        while True:
+            status, body = self.fetch(**params)
+            self.assertEqual(status, 200)
+            comments += [r['comment'] for r in body['rateings']]
+            if body['next_cursor'] is None:
+                break
+            params['cursor'] = body['next_cursor']
+        self.assertEqual(comments, ['Comment 4', 'Comment 3', 'Comment 1'])
+
+    def test_user_and_film_filters_combine(self):
+        status, body = self.fetch(fk_user=USER_B.hex(), fk_film=FILM_B.hex())
+        self.assertEqual(status, 200)
+        self.assertEqual([r['comment'] for r in body['rateings']], ['Comment 5'])
+        self.assertIsNone(body['next_cursor'])
+
+    def test_unscoped_returns_every_rateing(self):
+        status, body = self.fetch()
+        self.assertEqual(status, 200)
+        self.assertEqual(len(body), 5)
+
+    def test_fields_restrict_columns(self):
+        status, body = self.fetch(fk_film=FILM_A.hex(), limit='2', fields='grade')
+        self.assertEqual(status, 200)
+        self.assertEqual(set(body['rateings'][0]), {'rateing_id', 'grade'})
+        _, body = self.fetch(fk_film=FILM_A.hex(), cursor=body['next_cursor'], fields='grade')
+        self.assertEqual(len(body['rateings']), 1)
+
+        _, body = self.fetch(fields='comment')
+        self.assertEqual(set(body[0]), {'comment'})
+
+    def test_invalid_params(self):
+        self.assertEqual(self.fetch(fk_film='nothex')[0], 400)
+        self.assertEqual(self.fetch(fields='password')[0], 400)
+        self.assertEqual(self.fetch(fk_user=USER_A.hex(), limit='500')[0], 400)
+
+    def test_empty_scope_returns_404(self):
+        status, _ = self.fetch(fk_film=('cc' * 16))
+        self.assertEqual(status, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import json
+from get_user import get_user
+from get_user.get_user import lambda_handler
+from tests.unit.db_utils import patch_db_connection, sqlite_engine
+from sispe_common import tables
+
+USER = bytes([1]) * 16
+
+
+class GetUserTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        with self.engine.begin() as conn:
+            conn.execute(tables.users.insert().values(
+                user_id=USER, name='Ana', lastname='Ruiz', email='ana@example.com', password='secreto',
+                fk_rol=bytes(16), fk_subscription=bytes(16)))
+        patch_db_connection(self, self.engine, get_user)
+
+    def fetch(self, **params):
+        result = lambda_handler({'queryStringParameters': params or None}, None)
+        return result['statusCode'], json.loads(result['body'])
+
+    def test_password_is_never_returned(self):
+        status_code, body = self.fetch()
+        self.assertEqual(status_code, 200)
+        self.assertEqual(body[0]['email'], 'ana@example.com')
+        self.assertNotIn('password', body[0])
+        self.assertEqual(self.fetch(fields='name,password')[0], 400)
+
+    def test_fields_restrict_columns(self):
+        status_code, body = self.fetch(fields='name, lastname')
+        self.assertEqual(status_code, 200)
+        self.assertEqual(body, [{'name': 'Ana', 'lastname': 'Ruiz'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
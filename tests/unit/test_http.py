@@ -0,0 +1,22 @@
+import unittest
+from sispe_common.http import etag_for, etag_matches
+
+
+class EtagTestCase(unittest.TestCase):
+
+    def test_etag_changes_with_body(self):
+        self.assertEqual(etag_for('[1]'), etag_for('[1]'))
+        self.assertNotEqual(etag_for('[1]'), etag_for('[2]'))
+
+    def test_etag_matches(self):
+        etag = etag_for('[1]')
+        self.assertTrue(etag_matches({'headers': {'If-None-Match': etag}}, etag))
+        self.assertTrue(etag_matches({'headers': {'if-none-match': f'"otro", W/{etag}'}}, etag))
+        self.assertTrue(etag_matches({'headers': {'If-None-Match': '*'}}, etag))
+        self.assertFalse(etag_matches({'headers': {'If-None-Match': '"otro"'}}, etag))
+        self.assertFalse(etag_matches({'headers': None}, etag))
+        self.assertFalse(etag_matches({}, etag))
+
+
+if __name__ == '__main__':
+    unittest.main()
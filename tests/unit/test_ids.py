@@ -0,0 +1,33 @@
+from unittest.mock import patch
+import unittest
+import time
+from sispe_common import ids
+from sispe_common.ids import id_timestamp_ms, new_id
+from sispe_common.pagination import is_hex
+
+
+class IdsTestCase(unittest.TestCase):
+
+    def test_ids_are_uuidv7_and_hex_compatible(self):
+        value = new_id()
+        self.assertEqual(len(value), 16)
+        self.assertEqual(value[6] >> 4, 7)
+        self.assertEqual(value[8] >> 6, 0b10)
+        self.assertTrue(is_hex(value.hex()))
+        self.assertEqual(bytes.fromhex(value.hex()), value)
+        self.assertLessEqual(abs(id_timestamp_ms(value) - time.time() * 1000), 1000)
+
+    def test_ids_never_go_backwards(self):
+        generated = [new_id() for _ in range(10_000)]
+        self.assertEqual(generated, sorted(generated))
+        self.assertEqual(len(set(generated)), len(generated))
+
+        # Con el reloj detenido o hacia atrás se sigue avanzando la secuencia
+        last = new_id()
+        with patch.object(ids.time, 'time_ns', return_value=0):
+            later = [new_id() for _ in range(5000)]
+        self.assertEqual([last] + later, sorted([last] + later))
+
+
+if __name__ == '__main__':
+    unittest.main()
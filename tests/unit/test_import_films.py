@@ -0,0 +1,79 @@
+from unittest.mock import patch
+import unittest
+import json
+from sqlalchemy import select, func
+from sispe_common import tables
+from sispe_common.catalog import get_catalog_version
+from import_films import import_films
+from import_films.import_films import lambda_handler
+from tests.unit.db_utils import patch_db_connection, record_statements, sqlite_engine, start_patches
+
+CATEGORY = bytes.fromhex('0a' * 16)
+
+
+def film(n, **overrides):
+    item = {'title': f'Film {n}', 'description': 'Desc', 'length': 1.5, 'status': 'Activo',
+            'fk_category': CATEGORY.hex(), 'front_page': 'front.png', 'file': 'film.mp4'}
+    item.update(overrides)
+    return item
+
+
+class ImportFilmsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        with self.engine.begin() as conn:
+            conn.execute(tables.categories.insert().values(category_id=CATEGORY, name='A'))
+        self.statements = record_statements(self, self.engine)
+        patch_db_connection(self, self.engine, import_films)
+        start_patches(self, patch.object(import_films, 'CHUNK_SIZE', 2))
+
+    def film_count(self):
+        with self.engine.connect() as conn:
+            return conn.execute(select([func.count()]).select_from(tables.films)).scalar()
+
+    def test_json_array_with_row_errors(self):
+        body = [film(1), film(2, status='Borrado'), film(3, fk_category='ff' * 16), film(4), film(5), {'title': 'x'}]
+        result = lambda_handler({'body': json.dumps(body)}, None)
+        self.assertEqual(result['statusCode'], 200)
+        response = json.loads(result['body'])
+        self.assertEqual(response['inserted'], 3)
+        self.assertEqual([error['index'] for error in response['errors']], [1, 2, 5])
+        self.assertEqual(response['errors'][1]['error'], 'Category ID does not exist')
+        self.assertEqual(self.film_count(), 3)
+        with self.engine.connect() as conn:
+            self.assertEqual(get_catalog_version(conn), 1)
+
+    def test_invalid_lengths_are_row_errors(self):
+        lengths = [float('nan'), float('inf'), 150, 0, -1, 1.234, 'dos', 1.25]
+        result = lambda_handler({'body': json.dumps([film(n, length=length) for n, length in enumerate(lengths)])}, None)
+        self.assertEqual(result['statusCode'], 200)
+        response = json.loads(result['body'])
+        self.assertEqual(response['inserted'], 1)
+        self.assertEqual([error['index'] for error in response['errors']], list(range(7)))
+        self.assertIn('decimal places', response['errors'][5]['error'])
+
+    def test_round_trips(self):
+        lambda_handler({'body': json.dumps([film(n) for n in range(5)])}, None)
+        category_queries = [s for s in self.statements if s.startswith('SELECT categories')]
+        inserts = [s for s in self.statements if s.startswith('INSERT INTO films')]
+        self.assertEqual(len(category_queries), 1)
+        self.assertEqual(len(inserts), 3)
+
+    def test_ndjson(self):
+        body = '\n'.join([json.dumps(film(1)), '{no es json', json.dumps(film(2))])
+        result = lambda_handler({'body': body, 'headers': {'Content-Type': 'application/x-ndjson'}}, None)
+        response = json.loads(result['body'])
+        self.assertEqual(response['inserted'], 2)
+        self.assertEqual(response['errors'][0]['index'], 1)
+
+    def test_nothing_valid(self):
+        result = lambda_handler({'body': json.dumps([film(1, status='Borrado')])}, None)
+        self.assertEqual(result['statusCode'], 400)
+        self.assertEqual(self.film_count(), 0)
+        self.assertEqual(lambda_handler({'body': '[1,'}, None)['statusCode'], 400)
+        self.assertEqual(lambda_handler({'body': '[]'}, None)['statusCode'], 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import json
+from sispe_common import tables
+from create_rateing import create_rateing
+from get_leaderboard import get_leaderboard
+from refresh_leaderboard import refresh_leaderboard
+from update_film import update_film
+from tests.unit.db_utils import film_row, hex_row, patch_db_connection, sqlite_engine
+
+CATEGORY_A = bytes.fromhex('0a' * 16)
+CATEGORY_B = bytes.fromhex('0b' * 16)
+
+
+class LeaderboardTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        with self.engine.begin() as conn:
+            conn.execute(tables.categories.insert(), [
+                {'category_id': CATEGORY_A, 'name': 'A'},
+                {'category_id': CATEGORY_B, 'name': 'B'}
+            ])
+            conn.execute(tables.films.insert(), [
+                film_row(bytes([n]) * 16, title=f'Film {n}', fk_category=category, status=status)
+                for n, category, status in [(1, CATEGORY_A, 'Activo'), (2, CATEGORY_A, 'Activo'),
+                                            (3, CATEGORY_B, 'Activo'), (4, CATEGORY_B, 'Inactivo')]
+            ])
+        patch_db_connection(self, self.engine, create_rateing, get_leaderboard, refresh_leaderboard, update_film)
+
+    def rate(self, film, grade, user=1):
+        body = {'grade': grade, 'fk_user': (bytes([user]) * 16).hex(), 'fk_film': (bytes([film]) * 16).hex()}
+        self.assertEqual(create_rateing.lambda_handler({'body': json.dumps(body)}, None)['statusCode'], 200)
+
+    def leaderboard(self, **params):
+        result = get_leaderboard.lambda_handler({'queryStringParameters': params or None}, None)
+        return result['statusCode'], json.loads(result['body'])
+
+    def test_few_high_grades_rank_below_many_good_ones(self):
+        # Una sola nota perfecta no supera a muchas notas altas gracias al prior
+        self.rate(1, 9.9)
+        for user in range(20):
+            self.rate(2, 8.5, user=user)
+        self.rate(3, 2.0)
+        refresh_leaderboard.lambda_handler({}, None)
+        status, body = self.leaderboard()
+        self.assertEqual(status, 200)
+        self.assertEqual([film['title'] for film in body], ['Film 2', 'Film 1', 'Film 3'])
+        self.assertEqual(body[0]['rating_count'], 20)
+
+    def test_writes_update_ranking_without_refresh(self):
+        self.rate(3, 6.0)
+        self.rate(1, 4.0)
+        _, body = self.leaderboard()
+        self.assertEqual([film['title'] for film in body], ['Film 3', 'Film 1'])
+        self.rate(1, 9.9, user=2)
+        self.rate(1, 9.9, user=3)
+        _, body = self.leaderboard()
+        self.assertEqual(body[0]['title'], 'Film 1')
+
+    def test_category_filter_and_inactive_films(self):
+        self.rate(1, 7.0)
+        self.rate(3, 8.0)
+        self.rate(4, 9.9)
+        _, body = self.leaderboard(fk_category=CATEGORY_B.hex())
+        self.assertEqual([film['title'] for film in body], ['Film 3'])
+
+        # El cambio de categoría de la película se refleja en el ranking
+        film = hex_row(film_row(bytes([1]) * 16, title='Film 1', fk_category=CATEGORY_B))
+        update_film.lambda_handler({'body': json.dumps(film)}, None)
+        _, body = self.leaderboard(fk_category=CATEGORY_B.hex())
+        self.assertEqual([film['title'] for film in body], ['Film 3', 'Film 1'])
+
+    def test_invalid_params(self):
+        self.assertEqual(self.leaderboard(limit='0')[0], 400)
+        self.assertEqual(self.leaderboard(fk_category='xyz')[0], 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+from unittest.mock import patch
+import importlib
+import unittest
+import json
+import os
+from datetime import datetime, timedelta
+import re
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import MetaData, Table, Column, String, BINARY, DECIMAL, DateTime, Enum, ForeignKey, Index, \
+    UniqueConstraint, inspect
+from sispe_common import tables
+from tests.unit.db_utils import film_row, hex_row, patch_db_connection, record_statements, sqlite_engine, start_patches
+
+VERSIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                        'migrations', 'versions')
+MIGRATIONS = [importlib.import_module(f'migrations.versions.{name[:-3]}')
+              for name in sorted(os.listdir(VERSIONS)) if name[:4].isdigit() and name.endswith('.py')]
+
+# Esquema creado a mano antes de las migraciones: las tablas base sin ninguno de los índices,
+# llaves únicas ni columnas que agregan las migraciones. Los planes se revisan sobre lo que crean las
+# migraciones, no sobre lo que declara sispe_common.tables
+base_metadata = MetaData()
+Table('categories', base_metadata,
+      Column('category_id', BINARY(16), primary_key=True),
+      Column('name', String(45), nullable=False))
+Table('films', base_metadata,
+      Column('film_id', BINARY(16), primary_key=True),
+      Column('title', String(60), nullable=False),
+      Column('description', String(255), nullable=False),
+      Column('length', DECIMAL(4, 2), nullable=False),
+      Column('status', Enum('Activo', 'Inactivo', name='status_enum'), nullable=False),
+      Column('fk_category', BINARY(16), ForeignKey('categories.category_id'), nullable=False),
+      Column('front_page', String(255), nullable=False),
+      Column('file', String(255), nullable=False))
+Table('subscriptions', base_metadata,
+      Column('subscription_id', BINARY(16), primary_key=True),
+      Column('start_date', DateTime, nullable=False),
+      Column('end_date', DateTime, nullable=False))
+Table('users', base_metadata,
+      Column('user_id', BINARY(16), primary_key=True),
+      Column('name', String(60), nullable=False),
+      Column('lastname', String(60), nullable=False),
+      Column('email', String(100), nullable=False),
+      Column('password', String(255), nullable=False),
+      Column('fk_rol', BINARY(16), ForeignKey('roles.rol_id'), nullable=False),
+      Column('fk_subscription', BINARY(16), ForeignKey('subscriptions.subscription_id'), nullable=False),
+      UniqueConstraint('email', name='unique_email'),
+      Index('fk_rol_idx', 'fk_rol'),
+      Index('fk_subscription_idx', 'fk_subscription'))
+Table('favorites', base_metadata,
+      Column('favorite_id', BINARY(16), primary_key=True),
+      Column('fk_user', BINARY(16), ForeignKey('users.user_id'), nullable=False),
+      Column('fk_film', BINARY(16), ForeignKey('films.film_id'), nullable=False))
+Table('rateings', base_metadata,
+      Column('rateing_id', BINARY(16), primary_key=True),
+      Column('grade', DECIMAL(2, 1), nullable=False),
+      Column('comment', String(255), nullable=True),
+      Column('fk_user', BINARY(16), nullable=False),
+      Column('fk_film', BINARY(16), nullable=False))
+
+CATEGORY = bytes([1]) * 16
+USER = bytes([2]) * 16
+FILM = bytes([3]) * 16
+SUBSCRIPTION = bytes([4]) * 16
+ROL = bytes([5]) * 16
+RATEING = bytes([6]) * 16
+EMPTY_CATEGORY = bytes([7]) * 16
+NEW_FILM = {key: value for key, value in hex_row(film_row(FILM, fk_category=CATEGORY)).items() if key != 'film_id'}
+START_DATE = datetime.now() + timedelta(days=1)
+
+HANDLERS = ['get_films', 'batch_get', 'get_subscription', 'create_subscription', 'create_user', 'update_user',
+            'get_film', 'create_film', 'import_films', 'create_category', 'delete_category', 'get_favorites',
+            'create_favorite', 'delete_favorite', 'sync_favorites', 'get_rateing', 'create_rateing',
+            'update_rateing', 'delete_rateing', 'get_rating_stats', 'get_leaderboard', 'update_film',
+            'delete_film', 'delete_user', 'update_category']
+
+# Solicitudes de las rutas calientes. Quedan fuera los handlers que leen tablas completas a
+# propósito: get_user, get_categories, get_rateing sin filtros, search_films, suggest_films y
+# refresh_leaderboard
+REQUESTS = [
+    ('get_films', {'queryStringParameters': {'limit': '2'}}, 200),
+    ('get_films', {'queryStringParameters': {'status': 'Activo', 'fk_category': CATEGORY.hex()}}, 200),
+    ('get_films', {'queryStringParameters': {'sort': 'popular', 'user_id': USER.hex()}}, 200),
+    ('get_film', {'pathParameters': {'film_id': FILM.hex()}}, 200),
+    ('batch_get', {'pathParameters': {'entity': 'users'}, 'body': json.dumps({'ids': [USER.hex()]})}, 200),
+    ('get_subscription', {'pathParameters': {'subscription_id': SUBSCRIPTION.hex()}}, 200),
+    ('create_subscription', {'body': json.dumps({'start_date': START_DATE.isoformat(),
+                                                 'end_date': (START_DATE + timedelta(days=30)).isoformat()})}, 201),
+    ('create_user', {'body': json.dumps({'name': 'Luis', 'lastname': 'Mora', 'email': 'luis@example.com',
+                                         'fk_rol': ROL.hex(), 'fk_subscription': SUBSCRIPTION.hex()})}, 200),
+    ('update_user', {'body': json.dumps({'user_id': USER.hex(), 'name': 'Ana', 'lastname': 'Ruiz',
+                                         'email': 'ana@example.com', 'password': 'x', 'fk_rol': ROL.hex(),
+                                         'fk_subscription': SUBSCRIPTION.hex()})}, 200),
+    ('create_film', {'body': json.dumps(NEW_FILM)}, 200),
+    ('import_films', {'body': json.dumps([NEW_FILM, NEW_FILM])}, 200),
+    ('create_category', {'body': json.dumps({'name': 'Comedia'})}, 201),
+    ('delete_category', {'pathParameters': {'category_id': EMPTY_CATEGORY.hex()}}, 200),
+    ('get_favorites', {'pathParameters': {'fk_user': USER.hex()}}, 200),
+    ('create_favorite', {'body': json.dumps({'fk_user': USER.hex(), 'fk_film': FILM.hex()})}, 200),
+    ('delete_favorite', {'body': json.dumps({'fk_user': USER.hex(), 'fk_film': FILM.hex()})}, 200),
+    ('sync_favorites', {'body': json.dumps({'fk_user': USER.hex(), 'add': [FILM.hex()], 'remove': []})}, 200),
+    ('get_rateing', {'queryStringParameters': {'fk_film': FILM.hex()}}, 200),
+    ('get_rateing', {'queryStringParameters': {'fk_user': USER.hex()}}, 200),
+    ('create_rateing', {'body': json.dumps({'grade': 8.0, 'fk_user': USER.hex(), 'fk_film': FILM.hex()})}, 200),
+    ('update_rateing', {'pathParameters': {'id': RATEING.hex()},
+                        'body': json.dumps({'grade': 7.0, 'fk_user': USER.hex(), 'fk_film': FILM.hex()})}, 200),
+    ('get_rating_stats', {'queryStringParameters': {'fk_film': FILM.hex()}}, 200),
+    ('get_leaderboard', {'queryStringParameters': {'fk_category': CATEGORY.hex()}}, 200),
+    ('update_film', {'body': json.dumps(hex_row(film_row(FILM, fk_category=CATEGORY)))}, 200),
+    ('update_category', {'pathParameters': {'category_id': CATEGORY.hex()}, 'body': json.dumps({'name': 'Drama'})},
+     200),
+    ('delete_rateing', {'pathParameters': {'id': RATEING.hex()}}, 200),
+    ('delete_user', {'pathParameters': {'user_id': USER.hex()}}, 200),
+    ('delete_film', {'pathParameters': {'film_id': FILM.hex()}}, 200),
+]
+
+# "SCAN films" sin "USING ... INDEX" es una lectura completa de la tabla
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?\w+$')
+
+
+class QueryPlansTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.modules = {name: importlib.import_module(f'{name}.{name}') for name in HANDLERS}
+        self.engine = sqlite_engine(base_metadata)
+        with self.engine.begin() as conn, Operations.context(MigrationContext.configure(conn)):
+            for migration in MIGRATIONS:
+                migration.upgrade()
+        with self.engine.begin() as conn:
+            conn.execute(tables.subscriptions.insert().values(
+                subscription_id=SUBSCRIPTION, start_date=datetime(2026, 1, 1), end_date=datetime(2027, 1, 1)))
+            conn.execute(tables.categories.insert(), [{'category_id': CATEGORY, 'name': 'Drama'},
+                                                      {'category_id': EMPTY_CATEGORY, 'name': 'Vacía'}])
+            conn.execute(tables.films.insert().values(film_row(FILM, fk_category=CATEGORY)))
+            conn.execute(tables.users.insert().values(
+                user_id=USER, name='Ana', lastname='Ruiz', email='ana@example.com', password='x',
+                fk_rol=ROL, fk_subscription=SUBSCRIPTION))
+            conn.execute(tables.rateings.insert().values(rateing_id=RATEING, grade=5, fk_user=USER, fk_film=FILM))
+        patch_db_connection(self, self.engine, *self.modules.values())
+        # create_user da de alta al usuario en Cognito antes de insertarlo
+        start_patches(self, patch.object(self.modules['create_user'].boto3, 'client'))
+
+    def capture_statements(self):
+        statements = record_statements(self, self.engine, parameters=True)
+        for name, request, status_code in REQUESTS:
+            # Una solicitud que falla no llega a ejecutar las sentencias que se quieren revisar
+            self.assertEqual(self.modules[name].lambda_handler(request, None)['statusCode'], status_code,
+                             f'{name} {request}')
+        return [(statement, parameters) for statement, parameters in statements
+                if statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'INSERT'))]
+
+    def test_no_handler_statement_is_a_full_scan(self):
+        statements = self.capture_statements()
+        with self.engine.connect() as conn:
+            cursor = conn.connection.cursor()
+            for statement, parameters in statements:
+                plan = [row[-1] for row in cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters)]
+                scans = [step for step in plan if FULL_SCAN.match(step)]
+                self.assertEqual(scans, [], f'{statement}\n{plan}')
+
+    def test_migrations_create_the_declared_indexes(self):
+        inspector = inspect(self.engine)
+        for table in tables.metadata.tables.values():
+            if table.name == 'roles':
+                continue
+            names = {index['name'] for index in inspector.get_indexes(table.name)}
+            names |= {constraint['name'] for constraint in inspector.get_unique_constraints(table.name)}
+            # El índice FULLTEXT solo existe en MySQL
+            declared = {index.name for index in table.indexes if not index.dialect_options['mysql']['prefix']}
+            declared |= {constraint.name for constraint in table.constraints
+                         if isinstance(constraint, UniqueConstraint)}
+            self.assertEqual(declared - names, set(), table.name)
+
+    def test_migration_only_adds_missing_indexes(self):
+        with self.engine.connect() as conn:
+            names = {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertEqual(len([name for name in names if name.startswith('rateings_film')]), 1)
+        # La llave única unique_email ya sirve para buscar por email
+        self.assertNotIn('users_email_idx', names)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import json
+from sispe_common import tables
+from create_rateing import create_rateing
+from delete_rateing import delete_rateing
+from get_rating_stats import get_rating_stats
+from update_rateing import update_rateing
+from tests.unit.db_utils import patch_db_connection, record_statements, sqlite_engine
+
+FILM = bytes([1]) * 16
+OTHER_FILM = bytes([2]) * 16
+
+
+class RatingStatsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        patch_db_connection(self, self.engine, create_rateing, update_rateing, delete_rateing, get_rating_stats)
+
+    def rate(self, film_id, grade, user=1):
+        body = {'grade': grade, 'comment': 'ok', 'fk_user': (bytes([user]) * 16).hex(), 'fk_film': film_id.hex()}
+        return create_rateing.lambda_handler({'body': json.dumps(body)}, None)
+
+    def stats(self, *film_ids):
+        result = get_rating_stats.lambda_handler({'queryStringParameters': {'fk_film': ','.join(f.hex() for f in film_ids)}}, None)
+        return result['statusCode'], json.loads(result['body'])
+
+    def test_stats_follow_writes(self):
+        self.rate(FILM, 4.5, user=1)
+        self.rate(FILM, 3, user=2)
+        self.rate(FILM, 4.0, user=3)
+        status_code, body = self.stats(OTHER_FILM, FILM)
+        self.assertEqual(status_code, 200)
+        self.assertEqual(body[0], {'fk_film': OTHER_FILM.hex(), 'rating_count': 0, 'average': None,
+                                   'histogram': {str(n): 0 for n in range(10)}})
+        self.assertEqual(body[1]['rating_count'], 3)
+        self.assertEqual(body[1]['average'], 3.83)
+        self.assertEqual(body[1]['histogram']['3'], 1)
+        self.assertEqual(body[1]['histogram']['4'], 2)
+
+    def test_resubmission_updates_the_same_rateing(self):
+        self.assertEqual(json.loads(self.rate(FILM, 4.0, user=1)['body']), 'Rateing creado')
+        self.assertEqual(json.loads(self.rate(FILM, 8.0, user=1)['body']), 'Rateing actualizado')
+        with self.engine.connect() as conn:
+            rows = conn.execute(tables.rateings.select()).fetchall()
+        self.assertEqual([float(row['grade']) for row in rows], [8.0])
+        _, body = self.stats(FILM)
+        self.assertEqual(body[0]['rating_count'], 1)
+        self.assertEqual(body[0]['average'], 8.0)
+        self.assertEqual(body[0]['histogram']['4'], 0)
+        self.assertEqual(body[0]['histogram']['8'], 1)
+
+    def test_double_submission_takes_the_row_lock_first(self):
+        statements = record_statements(self, self.engine)
+        first, second = self.rate(FILM, 6.0, user=1), self.rate(FILM, 6.0, user=1)
+        self.assertEqual([first['statusCode'], second['statusCode']], [200, 200])
+        # El INSERT va antes que cualquier lectura de rateings y es la única escritura de la fila:
+        # nunca se bloquea una fila que todavía no existe
+        self.assertTrue(statements[0].lstrip().upper().startswith('INSERT INTO RATEINGS'))
+        writes = [s for s in statements if s.lstrip().upper().startswith(('INSERT INTO RATEINGS', 'UPDATE RATEINGS'))]
+        self.assertEqual(len(writes), 2)
+        # Crear o reenviar: INSERT ... ON CONFLICT, lectura de vuelta, agregados y ranking
+        self.assertEqual(len(statements), 4 + 4)
+        _, body = self.stats(FILM)
+        self.assertEqual(body[0]['rating_count'], 1)
+        self.assertEqual(body[0]['histogram']['6'], 1)
+
+    def test_update_and_delete_move_the_aggregates(self):
+        self.rate(FILM, 4.0, user=1)
+        self.rate(FILM, 6.0, user=2)
+        with self.engine.connect() as conn:
+            rateing_id = conn.execute(tables.rateings.select().where(tables.rateings.c.fk_user == bytes([1]) * 16)).fetchone()['rateing_id']
+        body = {'grade': 7.0, 'fk_user': (bytes([1]) * 16).hex(), 'fk_film': OTHER_FILM.hex()}
+        result = update_rateing.lambda_handler({'pathParameters': {'id': rateing_id.hex()}, 'body': json.dumps(body)}, None)
+        self.assertEqual(result['statusCode'], 200)
+        _, body = self.stats(FILM, OTHER_FILM)
+        self.assertEqual([stats['rating_count'] for stats in body], [1, 1])
+        self.assertEqual([stats['average'] for stats in body], [6.0, 7.0])
+
+        result = delete_rateing.lambda_handler({'pathParameters': {'id': rateing_id.hex()}}, None)
+        self.assertEqual(result['statusCode'], 200)
+        _, body = self.stats(OTHER_FILM)
+        self.assertEqual(body[0]['rating_count'], 0)
+
+    def test_invalid_grade_is_rejected(self):
+        self.assertEqual(self.rate(FILM, 12)['statusCode'], 400)
+        self.assertEqual(self.rate(FILM, 'diez')['statusCode'], 400)
+        for grade in ('NaN', 'Infinity', '-Infinity', float('nan'), float('inf')):
+            self.assertEqual(self.rate(FILM, grade)['statusCode'], 400, grade)
+        _, body = self.stats(FILM)
+        self.assertEqual(body[0]['rating_count'], 0)
+
+        self.assertEqual(self.rate(FILM, 8.0)['statusCode'], 200)
+        with self.engine.connect() as conn:
+            rateing_id = conn.execute(tables.rateings.select()).fetchone()['rateing_id']
+        body = {'grade': 'NaN', 'fk_user': (bytes([1]) * 16).hex(), 'fk_film': FILM.hex()}
+        result = update_rateing.lambda_handler({'pathParameters': {'id': rateing_id.hex()}, 'body': json.dumps(body)}, None)
+        self.assertEqual(result['statusCode'], 400)
+        _, body = self.stats(FILM)
+        self.assertEqual(body[0]['average'], 8.0)
+
+    def test_invalid_params(self):
+        self.assertEqual(get_rating_stats.lambda_handler({'queryStringParameters': None}, None)['statusCode'], 400)
+        self.assertEqual(get_rating_stats.lambda_handler({'queryStringParameters': {'fk_film': 'xyz'}}, None)['statusCode'], 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
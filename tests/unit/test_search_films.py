@@ -0,0 +1,89 @@
+from unittest.mock import patch
+import unittest
+import json
+from sqlalchemy.dialects import mysql
+from search_films import search_films
+from search_films.search_films import lambda_handler
+from tests.unit.db_utils import create_fts5_search_index, film_row, fts5_relevance_query, patch_db_connection, \
+    sqlite_engine, start_patches
+from sispe_common import tables
+
+CATEGORY_A = bytes.fromhex('0a' * 16)
+CATEGORY_B = bytes.fromhex('0b' * 16)
+
+
+class SearchFilmsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        with self.engine.begin() as conn:
+            create_fts5_search_index(conn)
+            conn.execute(tables.categories.insert(), [
+                {'category_id': CATEGORY_A, 'name': 'A'},
+                {'category_id': CATEGORY_B, 'name': 'B'}
+            ])
+            conn.execute(tables.films.insert(), [
+                film_row(bytes([1]) * 16, title='Matrix', description='Un hacker descubre la verdad sobre la matrix',
+                         fk_category=CATEGORY_A),
+                film_row(bytes([2]) * 16, title='Matrix Reloaded', description='Segunda parte', fk_category=CATEGORY_B),
+                film_row(bytes([3]) * 16, title='Titanic', description='Un barco que se hunde', fk_category=CATEGORY_A),
+                film_row(bytes([4]) * 16, title='Hackers', description='Un grupo de hackers', fk_category=CATEGORY_A,
+                         status='Inactivo')
+            ])
+        patch_db_connection(self, self.engine, search_films)
+        start_patches(self, patch.object(search_films, 'relevance_query', fts5_relevance_query))
+
+    def search(self, **params):
+        result = lambda_handler({'queryStringParameters': params}, None)
+        return result['statusCode'], json.loads(result['body'])
+
+    def test_ranks_by_relevance(self):
+        status_code, body = self.search(q='matrix')
+        self.assertEqual(status_code, 200)
+        self.assertEqual([film['title'] for film in body['films']], ['Matrix', 'Matrix Reloaded'])
+        self.assertGreaterEqual(body['films'][0]['score'], body['films'][1]['score'])
+
+    def test_filters(self):
+        _, body = self.search(q='matrix', fk_category=CATEGORY_B.hex())
+        self.assertEqual([film['title'] for film in body['films']], ['Matrix Reloaded'])
+        _, body = self.search(q='hacker hackers', status='Activo')
+        self.assertEqual([film['title'] for film in body['films']], ['Matrix'])
+
+    def test_paging(self):
+        _, first = self.search(q='matrix', limit='1')
+        self.assertEqual(first['next_offset'], 1)
+        _, second = self.search(q='matrix', limit='1', offset='1')
+        self.assertIsNone(second['next_offset'])
+        self.assertNotEqual(first['films'][0]['film_id'], second['films'][0]['film_id'])
+
+    def test_index_follows_writes(self):
+        with self.engine.begin() as conn:
+            conn.execute(tables.films.update().where(tables.films.c.film_id == bytes([3]) * 16)
+                         .values(title='Matrix Revolutions'))
+        _, body = self.search(q='revolutions')
+        self.assertEqual([film['title'] for film in body['films']], ['Matrix Revolutions'])
+
+    def test_invalid_params(self):
+        for params in ({}, {'q': '  '}, {'q': '!!'}, {'q': 'matrix', 'limit': '500'}, {'q': 'matrix', 'offset': '-1'},
+                       {'q': 'matrix', 'offset': 'x'}, {'q': 'matrix', 'offset': '5000'}):
+            status_code, _ = self.search(**params)
+            self.assertEqual(status_code, 400)
+
+
+# Las pruebas de arriba corren sobre FTS5; aquí se revisa la sentencia que se envía a MySQL
+class SearchQueryMySQLTestCase(unittest.TestCase):
+
+    def test_match_against_query(self):
+        compiled = search_films.search_query('matrix', 10, 20, 'Activo', CATEGORY_A).compile(dialect=mysql.dialect())
+        sql = ' '.join(str(compiled).split())
+        match = 'MATCH (films.title, films.description) AGAINST (%s IN NATURAL LANGUAGE MODE)'
+        self.assertIn(f'{match} AS score FROM films', sql)
+        self.assertIn(f'WHERE {match} AND films.`status` = %s AND films.fk_category = %s', sql)
+        self.assertTrue(sql.endswith('ORDER BY score DESC, films.film_id LIMIT %s, %s'), sql)
+        # MATCH usa q dos veces; LIMIT lleva el offset y una fila extra para saber si hay otra página
+        self.assertEqual([compiled.params[name] for name in compiled.positiontup],
+                         ['matrix', 'matrix', 'Activo', CATEGORY_A, 20, 11])
+
+
+if __name__ == '__main__':
+    unittest.main()
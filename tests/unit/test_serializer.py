@@ -0,0 +1,38 @@
+import unittest
+import json
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import MetaData, Table, Column, BINARY, DECIMAL, Integer, String, DateTime, select
+from sispe_common.serializer import dump_rows
+
+metadata = MetaData()
+items = Table('items', metadata,
+              Column('item_id', BINARY(16), primary_key=True),
+              Column('grade', DECIMAL(2, 1)),
+              Column('amount', Integer),
+              Column('name', String(60)),
+              Column('created', DateTime))
+
+
+class SerializerTestCase(unittest.TestCase):
+
+    def test_matches_json_dumps(self):
+        rows = [
+            (bytes.fromhex('ab' * 16), Decimal('4.5'), 3, 'Película "uno"', datetime(2024, 5, 1, 10, 30)),
+            (bytes.fromhex('cd' * 16), None, None, None, None)
+        ]
+        body, count = dump_rows(rows, items.select().selected_columns)
+        self.assertEqual(count, 2)
+        self.assertEqual(body, json.dumps([
+            {'item_id': 'ab' * 16, 'grade': 4.5, 'amount': 3, 'name': 'Película "uno"', 'created': '2024-05-01T10:30:00'},
+            {'item_id': 'cd' * 16, 'grade': None, 'amount': None, 'name': None, 'created': None}
+        ]))
+
+    def test_labels_and_empty_result(self):
+        query = select([items.c.name.label('item_name')])
+        self.assertEqual(dump_rows([('x',)], query.selected_columns), ('[{"item_name": "x"}]', 1))
+        self.assertEqual(dump_rows([], query.selected_columns), ('[]', 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
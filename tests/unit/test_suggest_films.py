@@ -0,0 +1,57 @@
+from unittest.mock import patch
+import unittest
+import json
+from sispe_common import tables
+from sispe_common.catalog import bump_catalog_version
+from suggest_films import suggest_films
+from suggest_films.suggest_films import lambda_handler
+from tests.unit.db_utils import film_row, patch_db_connection, sqlite_engine, start_patches
+
+
+class SuggestFilmsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = sqlite_engine(tables.metadata)
+        with self.engine.begin() as conn:
+            conn.execute(tables.films.insert(), [
+                film_row(bytes([1]) * 16, title='Matrix'),
+                film_row(bytes([2]) * 16, title='Matrix Reloaded'),
+                film_row(bytes([3]) * 16, title='Él Mariachi'),
+                film_row(bytes([4]) * 16, title='Mars Attacks', status='Inactivo')
+            ])
+        patch_db_connection(self, self.engine, suggest_films)
+        start_patches(self, patch.object(suggest_films, 'REFRESH_INTERVAL', 0),
+                      patch.dict(suggest_films.suggest_index, version=None, checked_at=0.0))
+
+    def suggest(self, **params):
+        result = lambda_handler({'queryStringParameters': params}, None)
+        return result['statusCode'], json.loads(result['body'])
+
+    def titles(self, q, **params):
+        _, body = self.suggest(q=q, **params)
+        return [suggestion['title'] for suggestion in body['suggestions']]
+
+    def test_prefix_lookup(self):
+        self.assertEqual(self.titles('mat'), ['Matrix', 'Matrix Reloaded'])
+        self.assertEqual(self.titles('MATRIX  r'), ['Matrix Reloaded'])
+        self.assertEqual(self.titles('ma', limit='1'), ['Matrix'])
+        self.assertEqual(self.titles('mars'), [])
+
+    def test_accent_insensitive(self):
+        self.assertEqual(self.titles('el mar'), ['Él Mariachi'])
+
+    def test_refreshes_when_catalog_changes(self):
+        self.assertEqual(self.titles('tit'), [])
+        with self.engine.begin() as conn:
+            conn.execute(tables.films.insert(), film_row(bytes([5]) * 16, title='Titanic'))
+            bump_catalog_version(conn)
+        self.assertEqual(self.titles('tit'), ['Titanic'])
+
+    def test_invalid_params(self):
+        self.assertEqual(self.suggest()[0], 400)
+        self.assertEqual(self.suggest(q='ma', limit='100')[0], 400)
+        self.assertEqual(self.suggest(q='ma', limit='diez'), (400, 'limit must be an integer'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,27 +1,20 @@
 import json
 import logging
-from sqlalchemy import create_engine, MetaData, Table, Column, String, BINARY
+from sqlalchemy import bindparam
 from sqlalchemy.exc import SQLAlchemyError
-import os
+from sispe_common.db import create_db_engine
+from sispe_common.tables import categories
 
 # Configuración del logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Configuración de la base de datos
-DB_USER = os.environ.get('DB_USER')
-DB_PASSWORD = os.environ.get('DB_PASSWORD')
-DB_NAME = os.environ.get('DB_NAME')
-DB_HOST = os.environ.get('DB_HOST')
+db_connection = create_db_engine()
 
-# Cadena de conexión
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-
-metadata = MetaData()
-categories = Table('categories', metadata,
-                   Column('category_id', BINARY(16), primary_key=True),
-                   Column('name', String(45), nullable=False))
+# Sentencia armada una sola vez por contenedor. Las columnas del SET salen de los parámetros
+# de cada ejecución, así que el id del WHERE usa un nombre que no es de columna
+UPDATE_CATEGORY = categories.update().where(categories.c.category_id == bindparam('target_id'))
 
 def lambda_handler(event, context):
     try:
@@ -35,10 +28,8 @@ def lambda_handler(event, context):
         if 'name' not in data:
             raise ValueError('The name field is required.')
         
-        conn = db_connection.connect()
-        query = categories.update().where(categories.c.category_id == bytes.fromhex(category_id)).values(name=data['name'])
-        conn.execute(query)
-        conn.close()
+        with db_connection.connect() as conn:
+            conn.execute(UPDATE_CATEGORY, {'target_id': bytes.fromhex(category_id), 'name': data['name']})
         
         return {
             'statusCode': 200,
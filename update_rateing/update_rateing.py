@@ -1,49 +1,50 @@
 import logging
 import json
-from sqlalchemy import create_engine, MetaData, Table, Column, DECIMAL, String, BINARY
-from sqlalchemy.exc import SQLAlchemyError
-import os
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sispe_common.db import create_db_engine
+from sispe_common.leaderboard import refresh_film
+from sispe_common.rating_stats import add_rating, parse_grade, remove_rating
+from sispe_common.tables import rateings
 
 # Configuración del logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Configuración de la base de datos
-DB_USER = os.environ.get("DB_USER")
-DB_PASSWORD = os.environ.get("DB_PASSWORD")
-DB_NAME = os.environ.get("DB_NAME")
-DB_HOST = os.environ.get("DB_HOST")
-db_connection_str = f'mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}'
-db_connection = create_engine(db_connection_str)
-metadata = MetaData()
-
-# Definición de la tabla de rateings
-rateings = Table('rateings', metadata,
-                 Column('rateing_id', BINARY(16), primary_key=True),
-                 Column('grade', DECIMAL(2,1), nullable=False),
-                 Column('comment', String(255), nullable=True),
-                 Column('fk_user', BINARY(16), nullable=False),
-                 Column('fk_film', BINARY(16), nullable=False),
-                 autoload_with=db_connection)
+db_connection = create_db_engine()
 
 # Función Lambda para actualizar un rateing
 def lambda_handler(event, context):
     try:
         logger.info("Updating rateing")
         data = json.loads(event['body'])
-        rateing_id = event['pathParameters']['id']
+        rateing_id = bytes.fromhex(event['pathParameters']['id'])
+
+        grade = parse_grade(data['grade'])
+        fk_film = bytes.fromhex(data['fk_film'])
 
-        conn = db_connection.connect()
-        query = rateings.update().where(rateings.c.rateing_id == bytes.fromhex(rateing_id)).values(
-            grade=data['grade'],
-            comment=data.get('comment'),
-            fk_user=bytes.fromhex(data['fk_user']),
-            fk_film=bytes.fromhex(data['fk_film'])
-        )
-        result = conn.execute(query)
-        conn.close()
+        with db_connection.connect() as conn:
+            query = rateings.update().where(rateings.c.rateing_id == rateing_id).values(
+                grade=grade,
+                comment=data.get('comment'),
+                fk_user=bytes.fromhex(data['fk_user']),
+                fk_film=fk_film
+            )
+            # Se descuenta la calificación anterior y se suma la nueva en la misma transacción,
+            # junto con el ranking de las películas afectadas
+            with conn.begin():
+                previous = conn.execute(select([rateings.c.grade, rateings.c.fk_film])
+                                        .where(rateings.c.rateing_id == rateing_id)
+                                        .with_for_update()).fetchone()
+                if previous:
+                    conn.execute(query)
+                    remove_rating(conn, previous['fk_film'], previous['grade'])
+                    add_rating(conn, fk_film, grade)
+                    for film_id in {previous['fk_film'], fk_film}:
+                        refresh_film(conn, film_id)
 
-        if result.rowcount:
+        if previous:
             return {
                 'statusCode': 200,
                 'body': json.dumps('Rateing updated')
@@ -53,6 +54,12 @@ def lambda_handler(event, context):
                 'statusCode': 404,
                 'body': json.dumps('Rateing not found')
             }
+    except IntegrityError as e:
+        logger.error(f"Duplicate rateing: {e}")
+        return {
+            'statusCode': 409,
+            'body': json.dumps('El usuario ya calificó esta película')
+        }
     except SQLAlchemyError as e:
         logger.error(f"Error updating rateing: {e}")
         return {
@@ -65,6 +72,12 @@ def lambda_handler(event, context):
             'statusCode': 400,
             'body': json.dumps('Invalid JSON format')
         }
+    except ValueError as e:
+        logger.error(f"Invalid rateing data: {e}")
+        return {
+            'statusCode': 400,
+            'body': json.dumps(f'Invalid rateing data: {e}')
+        }
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         return {